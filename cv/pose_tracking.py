@@ -7,6 +7,8 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from utils.state_manager import HAND_LANDMARK_NAMES, POSE_LANDMARK_NAMES
+
 # Initialize MediaPipe Holistic once globally for efficiency
 mp_holistic = mp.solutions.holistic
 mp_drawing = mp.solutions.drawing_utils
@@ -14,6 +16,20 @@ mp_drawing_styles = mp.solutions.drawing_styles
 mp_pose = mp.solutions.pose
 mp_hands = mp.solutions.hands
 
+# Landmark names by index (the lowercased MediaPipe enum names), resolved
+# once instead of constructing an enum per landmark every frame
+_LEFT_HAND_NAMES = tuple(f"left_{name}" for name in HAND_LANDMARK_NAMES)
+_RIGHT_HAND_NAMES = tuple(f"right_{name}" for name in HAND_LANDMARK_NAMES)
+
+# One pose landmark row (x, y, z, visibility) for np.fromiter
+_POSE_ROW_DTYPE = np.dtype((np.float32, 4))
+
+
+def _landmark_name(names, idx, fallback_prefix):
+    """Name of landmark idx, or '<fallback_prefix>_<idx>' past the known names."""
+    return names[idx] if idx < len(names) else f"{fallback_prefix}_{idx}"
+
+
 # Global holistic instance
 holistic = mp_holistic.Holistic(
     min_detection_confidence=0.5,
@@ -32,6 +48,8 @@ def get_landmarks(frame):
     Returns:
         dict: Dictionary containing normalized (x, y, z) coordinates for landmarks:
             - 'pose': list of 33 pose landmarks
+            - 'pose_array': (33, 4) float32 array of the pose landmarks
+              (x, y, z, visibility per row), copied straight from MediaPipe
             - 'left_hand': list of 21 left hand landmarks
             - 'right_hand': list of 21 right hand landmarks
             - 'face': list of 468 face landmarks
@@ -50,6 +68,7 @@ def get_landmarks(frame):
     # Extract landmarks into a structured dictionary
     landmarks_dict = {
         'pose': None,
+        'pose_array': None,
         'left_hand': None,
         'right_hand': None,
         'face': None,
@@ -58,33 +77,29 @@ def get_landmarks(frame):
     
     # Extract pose landmarks (33 landmarks)
     if results.pose_landmarks:
+        landmarks = results.pose_landmarks.landmark
         pose_landmarks = []
-        for idx, lm in enumerate(results.pose_landmarks.landmark):
-            try:
-                landmark_enum = mp_pose.PoseLandmark(idx)
-                name = landmark_enum.name.lower()
-            except ValueError:
-                name = f"pose_{idx}"
+        for idx, lm in enumerate(landmarks):
             pose_landmarks.append({
-                'name': name,
+                'name': _landmark_name(POSE_LANDMARK_NAMES, idx, "pose"),
                 'x': lm.x,
                 'y': lm.y,
                 'z': lm.z,
                 'visibility': lm.visibility
             })
         landmarks_dict['pose'] = pose_landmarks
+        # Same landmarks as one array, for the state manager's pose ring
+        landmarks_dict['pose_array'] = np.fromiter(
+            ((lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks),
+            dtype=_POSE_ROW_DTYPE, count=len(landmarks)
+        )
     
     # Extract left hand landmarks (21 landmarks)
     if results.left_hand_landmarks:
         left_hand_landmarks = []
         for idx, lm in enumerate(results.left_hand_landmarks.landmark):
-            try:
-                landmark_enum = mp_hands.HandLandmark(idx)
-                name = landmark_enum.name.lower()
-            except ValueError:
-                name = f"hand_{idx}"
             left_hand_landmarks.append({
-                'name': f"left_{name}",
+                'name': _landmark_name(_LEFT_HAND_NAMES, idx, "left_hand"),
                 'x': lm.x,
                 'y': lm.y,
                 'z': lm.z
@@ -95,13 +110,8 @@ def get_landmarks(frame):
     if results.right_hand_landmarks:
         right_hand_landmarks = []
         for idx, lm in enumerate(results.right_hand_landmarks.landmark):
-            try:
-                landmark_enum = mp_hands.HandLandmark(idx)
-                name = landmark_enum.name.lower()
-            except ValueError:
-                name = f"hand_{idx}"
             right_hand_landmarks.append({
-                'name': f"right_{name}",
+                'name': _landmark_name(_RIGHT_HAND_NAMES, idx, "right_hand"),
                 'x': lm.x,
                 'y': lm.y,
                 'z': lm.z
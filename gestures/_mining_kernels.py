@@ -0,0 +1,226 @@
+"""
+Numeric per-frame kernels for the mining gesture detector
+
+Compiled with numba when it is installed (see utils.jit), plain Python otherwise.
+"""
+
+from enum import IntEnum
+from math import isnan, nan, sqrt
+
+import numpy as np
+from utils.jit import njit
+
+
+class Action(IntEnum):
+    """Integer action codes returned by MiningDetector.detect_code()."""
+    NONE = 0
+    START_HOLD = 1
+    CONTINUE_HOLD = 2
+    STOP_HOLD = 3
+
+
+@njit(cache=True)
+def _low_pass(value, previous, alpha):
+    """One-pole IIR low-pass filter step (previous is NaN before the first sample)."""
+    if isnan(previous):
+        return value
+    return previous + alpha * (value - previous)
+
+
+@njit(cache=True)
+def _is_vertical_stab(x_velocity, y_velocity, y_threshold_sq, x_threshold_sq):
+    """
+    Check for a fast, mostly vertical wrist motion (velocity normalized by shoulder width).
+    
+    Compares squared velocities against squared thresholds, which is
+    equivalent to comparing magnitudes since both sides are non-negative.
+    """
+    return y_velocity * y_velocity > y_threshold_sq and x_velocity * x_velocity < x_threshold_sq
+
+
+@njit(cache=True)
+def _update_oscillation(v, mean, var, last_sign, alpha, gain_sq, min_amplitude_sq):
+    """
+    Online EMA mean/variance peak detector for a velocity signal.
+    
+    A peak is a flip in the sign of (v - mean) where the deviation exceeds
+    max(gain * std, min_amplitude). The comparison is done on squares
+    (gain_sq, min_amplitude_sq) so no sqrt is needed. mean is NaN before
+    the first sample.
+    
+    Returns:
+        (mean, var, sign, is_peak)
+    """
+    if isnan(mean):
+        return v, 0.0, 0.0, False
+    
+    mean += alpha * (v - mean)
+    deviation = v - mean
+    deviation_sq = deviation * deviation
+    var += alpha * (deviation_sq - var)
+    
+    if deviation_sq <= max(gain_sq * var, min_amplitude_sq):
+        return mean, var, last_sign, False
+    
+    sign = 1.0 if deviation > 0 else -1.0
+    return mean, var, sign, last_sign != 0.0 and sign != last_sign
+
+
+@njit(cache=True, fastmath=True)
+def _polygon_area(points):
+    """Compute area via shoelace formula on the x/y columns of an (N, 2+) array."""
+    n = points.shape[0]
+    twice_area = 0.0
+    for i in range(n):
+        j = (i + 1) % n
+        twice_area += points[i, 0] * points[j, 1] - points[j, 0] * points[i, 1]
+    return 0.5 * abs(twice_area)
+
+
+@njit(cache=True, fastmath=True)
+def _median5(a, b, c, d, e):
+    """
+    Median of five values with a fixed min/max network (no sort, no allocation).
+    
+    The smallest and largest of a..d can't be the median, so drop them and
+    take the median of e and the two that remain.
+    """
+    f = max(min(a, b), min(c, d))
+    g = min(max(a, b), max(c, d))
+    return max(min(e, f), min(max(e, f), g))
+
+
+@njit(cache=True, fastmath=True)
+def _hand_scale(positions, pairs, min_distance):
+    """
+    Median of the distances between the given (start, end) row pairs of positions.
+    
+    Distances at or below min_distance are ignored; returns 0.0 if none remain.
+    """
+    distances = np.empty(pairs.shape[0])
+    n = 0
+    for k in range(pairs.shape[0]):
+        a = pairs[k, 0]
+        b = pairs[k, 1]
+        dx = positions[a, 0] - positions[b, 0]
+        dy = positions[a, 1] - positions[b, 1]
+        dz = positions[a, 2] - positions[b, 2]
+        distance = sqrt(dx * dx + dy * dy + dz * dz)
+        if distance > min_distance:
+            distances[n] = distance
+            n += 1
+    
+    if n == 5:
+        return _median5(distances[0], distances[1], distances[2], distances[3], distances[4])
+    if n == 0:
+        return 0.0
+    
+    # Some distances were rejected: median of the rest via a small sort
+    valid = np.sort(distances[:n])
+    mid = n // 2
+    if n % 2:
+        return valid[mid]
+    return 0.5 * (valid[mid - 1] + valid[mid])
+
+
+@njit(cache=True, fastmath=True)
+def _point_distance(a, b):
+    """Euclidean distance between two [x, y, z] points."""
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    dz = b[2] - a[2]
+    return sqrt(dx * dx + dy * dy + dz * dz)
+
+
+@njit(cache=True, fastmath=True)
+def _normalized_velocity(current, past, inv_time, inv_scale):
+    """X/Y velocity between two [x, y, z] points, scaled by 1 / (time * scale)."""
+    factor = inv_time * inv_scale
+    return (current[0] - past[0]) * factor, (current[1] - past[1]) * factor
+
+
+# Sentinel for an unset monotonic_ns timestamp
+_NO_TIME = -1
+
+# Hold states
+_STATE_IDLE = 0
+_STATE_HOLDING = 1
+
+# Per-frame events, classified in priority order
+_EVENT_HAND_OPEN = 0       # Open hand (placing, not mining)
+_EVENT_NO_SCALE = 1        # Shoulder distance unusable, velocity can't be judged
+_EVENT_STAB = 2            # Fast vertical stab
+_EVENT_OSCILLATING = 3     # Wrist still pumping without a full stab
+_EVENT_IN_GRACE = 4        # No motion, but within the hold grace period
+_EVENT_QUIET = 5           # No motion and grace period expired
+
+# Transition table: [state, event] -> next state / action code
+# Columns follow the event order above: OPEN, NO_SCALE, STAB, OSCILLATING, IN_GRACE, QUIET
+_NEXT_STATE = np.array([
+    # From IDLE: only a stab starts a hold
+    [_STATE_IDLE, _STATE_IDLE, _STATE_HOLDING, _STATE_IDLE, _STATE_IDLE, _STATE_IDLE],
+    # From HOLDING: an open hand or an expired grace period ends it
+    [_STATE_IDLE, _STATE_HOLDING, _STATE_HOLDING, _STATE_HOLDING, _STATE_HOLDING, _STATE_IDLE],
+], dtype=np.int8)
+_TRANSITION_ACTION = np.array([
+    [Action.NONE, Action.NONE, Action.START_HOLD,
+     Action.NONE, Action.NONE, Action.NONE],
+    [Action.STOP_HOLD, Action.NONE, Action.CONTINUE_HOLD,
+     Action.CONTINUE_HOLD, Action.CONTINUE_HOLD, Action.STOP_HOLD],
+], dtype=np.int8)
+# Events that count as fresh motion (refresh the last motion time)
+_EVENT_IS_MOTION = np.array([False, False, True, True, False, False])
+
+
+@njit(cache=True)
+def _mining_step(is_stab, shoulder_valid, hand_is_open, is_oscillating, is_holding,
+                 last_motion_time, now, grace_period_ns):
+    """
+    Advance the mining hold state by one frame via the transition table.
+    
+    Times are monotonic nanosecond integers (state_manager.current_time_ns); last_motion_time is _NO_TIME
+    when unset. While holding, an ongoing wrist oscillation counts as
+    motion even if no single frame is a full stab.
+    
+    Returns:
+        (action_code, is_holding, last_motion_time)
+    """
+    if hand_is_open:
+        event = _EVENT_HAND_OPEN
+    elif not shoulder_valid:
+        event = _EVENT_NO_SCALE
+    elif is_stab:
+        event = _EVENT_STAB
+    elif is_oscillating:
+        event = _EVENT_OSCILLATING
+    elif last_motion_time != _NO_TIME and now - last_motion_time <= grace_period_ns:
+        event = _EVENT_IN_GRACE
+    else:
+        event = _EVENT_QUIET
+    
+    state = _STATE_HOLDING if is_holding else _STATE_IDLE
+    next_state = _NEXT_STATE[state, event]
+    
+    if next_state == _STATE_IDLE:
+        last_motion_time = _NO_TIME
+    elif _EVENT_IS_MOTION[event]:
+        last_motion_time = now
+    
+    return _TRANSITION_ACTION[state, event], next_state == _STATE_HOLDING, last_motion_time
+
+
+# Sample calls for utils.jit.warm_up(): fingertip rows then hand-scale rows,
+# sliced as the detector does
+_WARM_UP_HAND = np.zeros((10, 3), dtype=np.float32)
+_WARM_UP_POINT = np.zeros(3)
+WARM_UP_CALLS = (
+    (_polygon_area, (_WARM_UP_HAND[:5],)),
+    (_median5, (0.0, 0.0, 0.0, 0.0, 0.0)),
+    (_hand_scale, (_WARM_UP_HAND[5:], np.array([[0, 1], [0, 2], [0, 3], [0, 4], [1, 4]]), 1e-5)),
+    (_point_distance, (_WARM_UP_POINT, _WARM_UP_POINT)),
+    (_normalized_velocity, (_WARM_UP_POINT, _WARM_UP_POINT, 1.0, 1.0)),
+    (_low_pass, (0.0, nan, 0.5)),
+    (_is_vertical_stab, (0.0, 0.0, 1.0, 1.0)),
+    (_update_oscillation, (0.0, nan, 0.0, 0.0, 0.5, 0.25, 0.25)),
+    (_mining_step, (False, True, False, False, False, _NO_TIME, 0, 1)),
+)
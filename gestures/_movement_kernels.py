@@ -0,0 +1,97 @@
+"""
+Numeric per-frame kernels for the movement gesture detector
+
+Compiled with numba when it is installed (see utils.jit), plain Python otherwise.
+"""
+
+from math import isnan
+
+import numpy as np
+from utils.jit import njit
+
+
+@njit(cache=True)
+def _leg_features(y_positions, velocity_frames, time_delta, min_count):
+    """
+    Vertical velocity and range of motion of a leg landmark pair, in one pass.
+
+    NaN entries (missing landmarks) are skipped for the ranges; a column
+    with fewer than min_count valid values has range 0.0. A velocity is NaN
+    if either of its endpoint frames is missing the landmark.
+
+    Args:
+        y_positions: (N, 2) array of left/right Y positions, oldest frame first
+        velocity_frames: Velocity is the change over the last this many
+            frames (N must be at least this)
+        time_delta: Time spanned by those frames, in seconds
+        min_count: Minimum valid values for a column's range
+
+    Returns:
+        (left_vy, right_vy, left_range, right_range)
+    """
+    last = y_positions.shape[0] - 1
+    first = last - (velocity_frames - 1)
+    velocities = np.empty(2)
+    ranges = np.zeros(2)
+    for col in range(2):
+        velocities[col] = (float(y_positions[last, col]) - float(y_positions[first, col])) / time_delta
+        count = 0
+        low = 0.0
+        high = 0.0
+        for row in range(y_positions.shape[0]):
+            y = y_positions[row, col]
+            if isnan(y):
+                continue
+            if count == 0 or y < low:
+                low = y
+            if count == 0 or y > high:
+                high = y
+            count += 1
+        if count >= min_count:
+            ranges[col] = high - low
+    return velocities[0], velocities[1], ranges[0], ranges[1]
+
+
+@njit(cache=True, fastmath=True)
+def _leg_motion_score(left_vy, right_vy, left_range, right_range, inv_scale, min_speed, min_range):
+    """
+    Combine leg vertical velocity and range of motion into a walking score.
+
+    Args:
+        left_vy, right_vy: Raw vertical velocities of the leg landmarks
+        left_range, right_range: Raw Y ranges of the leg landmarks
+        inv_scale: 1 / body scale factor both are normalized by
+        min_speed, min_range: Deadzones below which the motion is ignored
+
+    Returns:
+        (score, opposite_sign): the un-gated score and whether the legs move
+        in opposite vertical directions, both fast enough
+    """
+    left_vy = left_vy * inv_scale
+    right_vy = right_vy * inv_scale
+    left_speed = abs(left_vy)
+    right_speed = abs(right_vy)
+
+    normalized_speed = (left_speed + right_speed) * 0.5
+    normalized_range = (left_range + right_range) * 0.5 * inv_scale
+
+    # Deadzone: ignore tiny vibrations. Written with bitwise ops on bools
+    # rather than and/if, so the kernel stays straight-line code (gait makes
+    # these conditions flip unpredictably from frame to frame)
+    in_deadzone = (normalized_speed < min_speed) & (normalized_range < min_range)
+
+    # Scale factors chosen to bring scores into ~0-1 range
+    score = (normalized_speed * 8.0 + normalized_range * 4.0) / 2.0 * (1.0 - in_deadzone)
+
+    # Signs differ and both legs move fast enough (the speed checks rule out
+    # zero velocities, so comparing sign bits matches a negative product)
+    opposite_sign = ((left_vy < 0.0) ^ (right_vy < 0.0)) & (left_speed >= min_speed) & (right_speed >= min_speed)
+    return score, opposite_sign
+
+
+# Sample calls for utils.jit.warm_up(), using the same fancy-index slice of a
+# pose history as the detector (so the same array layout)
+WARM_UP_CALLS = (
+    (_leg_features, (np.zeros((2, 33, 4), dtype=np.float32)[:, (0, 1), 1], 2, 1.0, 1)),
+    (_leg_motion_score, (0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0)),
+)
@@ -0,0 +1,38 @@
+"""
+Numeric per-frame kernels for the placing gesture detector
+
+Compiled with numba when it is installed (see utils.jit), plain Python otherwise.
+"""
+
+import numpy as np
+from utils.jit import njit
+
+
+@njit(cache=True, fastmath=True)
+def _pentagon_area(points):
+    """
+    Compute the area of a five-point polygon via the shoelace formula.
+    
+    Unrolled for exactly five points (the fingertips), so there is no loop
+    or index wrap-around.
+    
+    Args:
+        points: (5, 2+) array; only the x/y columns are used
+    
+    Returns:
+        float: Polygon area
+    """
+    twice_area = (
+        points[0, 0] * points[1, 1] - points[1, 0] * points[0, 1]
+        + points[1, 0] * points[2, 1] - points[2, 0] * points[1, 1]
+        + points[2, 0] * points[3, 1] - points[3, 0] * points[2, 1]
+        + points[3, 0] * points[4, 1] - points[4, 0] * points[3, 1]
+        + points[4, 0] * points[0, 1] - points[0, 0] * points[4, 1]
+    )
+    return 0.5 * abs(twice_area)
+
+
+# Sample calls for utils.jit.warm_up()
+WARM_UP_CALLS = (
+    (_pentagon_area, (np.zeros((5, 3)),)),
+)
@@ -0,0 +1,60 @@
+"""
+Numeric per-frame kernels for the shield gesture detector
+
+Compiled with numba when it is installed (see utils.jit), plain Python otherwise.
+"""
+
+from math import isnan
+
+import numpy as np
+from utils.jit import njit
+
+
+@njit(cache=True)
+def _shield_decide(pose, shoulder, elbow, wrist, sin2_tol, min_forward, max_height):
+    """
+    Classify the left arm as missing, not blocking, or in blocking position.
+
+    The three conditions are tested cheapest first: wrist forward of the
+    shoulder, wrist at shoulder height, then forearm within the angle
+    tolerance of horizontal (as dy^2 <= sin^2(tol) * (dx^2 + dy^2), so no
+    atan2; a zero-length forearm counts as horizontal).
+
+    Args:
+        pose: (33, 4) pose frame array (x, y, z, visibility; NaN when missing)
+        shoulder, elbow, wrist: Row indices of the arm landmarks
+        sin2_tol: sin^2 of the horizontal angle tolerance
+        min_forward: Minimum distance of the wrist in front of the shoulder
+        max_height: Maximum vertical distance of the wrist from the shoulder
+
+    Returns:
+        -1 if any of the landmarks is missing, 1 if the arm is in blocking
+        position, 0 otherwise
+    """
+    for row in (shoulder, elbow, wrist):
+        for col in range(3):
+            if isnan(pose[row, col]):
+                return -1
+
+    # Differences are taken at the array's precision, then widened, so the
+    # comparisons match the ones made on Python floats
+    # (negative z = closer to the camera)
+    forward = float(pose[shoulder, 2] - pose[wrist, 2])
+    if forward < min_forward:
+        return 0
+    if abs(float(pose[wrist, 1] - pose[shoulder, 1])) > max_height:
+        return 0
+
+    dx = float(pose[wrist, 0] - pose[elbow, 0])
+    dy = float(pose[wrist, 1] - pose[elbow, 1])
+    dy_sq = dy * dy
+    if dy_sq <= sin2_tol * (dx * dx + dy_sq):
+        return 1
+    return 0
+
+
+# Sample calls for utils.jit.warm_up(), with a pose array of the same layout
+# as a GestureStateManager.get_pose_frame() view
+WARM_UP_CALLS = (
+    (_shield_decide, (np.zeros((33, 4), dtype=np.float32), 11, 13, 15, 0.5, 0.1, 0.15)),
+)
@@ -2,8 +2,7 @@
 Attack gesture detector - detects horizontal punching motions for single left clicks
 """
 
-import time
-import numpy as np
+import math
 from gestures.base_detector import BaseGestureDetector
 
 
@@ -41,9 +40,13 @@ class AttackDetector(BaseGestureDetector):
         self.click_cooldown = 0.3
         # ==================================================================
         
+        # Squared velocity thresholds for the per-frame comparison
+        self._x_threshold_sq = self.x_velocity_threshold ** 2
+        self._y_threshold_sq = self.y_velocity_threshold ** 2
+        
         # State tracking
         self._state = {
-            'last_click_time': None,  # Time of last attack click
+            'last_click_time': None,  # state_manager.current_time of last attack click
         }
     
     def detect(self, state_manager):
@@ -71,29 +74,32 @@ class AttackDetector(BaseGestureDetector):
             return None
         
         # Get shoulder distance for normalization
-        shoulder_distance = self._get_shoulder_distance(state_manager)
+        get_pos = state_manager.get_landmark_position
+        left_shoulder = get_pos('left_shoulder', 0)
+        right_shoulder = get_pos('right_shoulder', 0)
+        shoulder_distance = self._get_shoulder_distance(left_shoulder, right_shoulder)
         
         if shoulder_distance is None or shoulder_distance < 1e-5:
             return None
         
-        # Normalize velocity by shoulder distance for scale-invariance
-        normalized_velocity = velocity_vector / shoulder_distance
-        
-        # Extract x and y components
-        x_velocity = abs(normalized_velocity[0])  # Absolute x-axis speed
-        y_velocity = abs(normalized_velocity[1])  # Absolute y-axis speed
+        # Compare squared raw velocity against the squared thresholds scaled by
+        # shoulder distance (same as thresholding |velocity| / shoulder_distance,
+        # without the division and abs)
+        x_velocity = float(velocity_vector[0])
+        y_velocity = float(velocity_vector[1])
+        shoulder_distance_sq = shoulder_distance * shoulder_distance
         
         # Check if movement is primarily horizontal and fast enough
         is_horizontal_punch = (
-            x_velocity > self.x_velocity_threshold and 
-            y_velocity < self.y_velocity_threshold
+            x_velocity * x_velocity > self._x_threshold_sq * shoulder_distance_sq and
+            y_velocity * y_velocity < self._y_threshold_sq * shoulder_distance_sq
         )
         
         if not is_horizontal_punch:
             return None
         
-        # Check cooldown
-        current_time = time.time()
+        # Check cooldown (monotonic seconds, immune to wall-clock jumps)
+        current_time = state_manager.current_time
         last_click_time = self._state['last_click_time']
         
         if last_click_time is not None:
@@ -106,25 +112,26 @@ class AttackDetector(BaseGestureDetector):
         self._state['last_click_time'] = current_time
         return {'action': 'attack_click'}
     
-    def _get_shoulder_distance(self, state_manager):
+    def _get_shoulder_distance(self, left_shoulder, right_shoulder):
         """
         Calculate the distance between the two shoulders (landmarks 11 and 12).
         This is used to normalize velocities for scale-invariance.
         
         Args:
-            state_manager: GestureStateManager instance
+            left_shoulder: numpy array [x, y, z] for pose landmark 11 (or None)
+            right_shoulder: numpy array [x, y, z] for pose landmark 12 (or None)
         
         Returns:
             float: Distance between shoulders, or None if landmarks not available
         """
-        # Pose landmarks 11 = left shoulder, 12 = right shoulder
-        left_shoulder = state_manager.get_landmark_position('left_shoulder')
-        right_shoulder = state_manager.get_landmark_position('right_shoulder')
-        
         if left_shoulder is None or right_shoulder is None:
             return None
         
-        return float(np.linalg.norm(right_shoulder - left_shoulder))
+        return math.hypot(
+            float(right_shoulder[0]) - float(left_shoulder[0]),
+            float(right_shoulder[1]) - float(left_shoulder[1]),
+            float(right_shoulder[2]) - float(left_shoulder[2]),
+        )
     
     def reset(self):
         """Reset attack detector state."""
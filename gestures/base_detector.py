@@ -4,6 +4,8 @@ Base class for gesture detectors
 
 from abc import ABC, abstractmethod
 
+from utils.jit import warm_up
+
 
 class BaseGestureDetector(ABC):
     """
@@ -11,6 +13,11 @@ class BaseGestureDetector(ABC):
     All gesture detectors should inherit from this class.
     """
     
+    # Module of numeric kernels the detector calls every frame (see
+    # utils.jit.warm_up), compiled at construction rather than on the first
+    # frame; None for detectors without kernels
+    _kernels = None
+    
     def __init__(self, name):
         """
         Initialize the gesture detector.
@@ -23,6 +30,9 @@ class BaseGestureDetector(ABC):
         
         # Internal state for pattern tracking
         self._state = {}
+        
+        if self._kernels is not None:
+            warm_up(self._kernels)
     
     @abstractmethod
     def detect(self, state_manager):
@@ -38,6 +48,23 @@ class BaseGestureDetector(ABC):
         """
         pass
     
+    def detect_frame(self, current_landmarks, state_manager):
+        """
+        Detect gesture given the current frame's landmarks.
+        
+        The main loop fetches the newest landmark frame once and passes it to
+        every detector. Detectors that read the raw frame (face landmarks,
+        hand lists) override this; the default just defers to detect().
+        
+        Args:
+            current_landmarks: Landmark dictionary for the current frame
+            state_manager: GestureStateManager instance with landmark history
+        
+        Returns:
+            Same as detect()
+        """
+        return self.detect(state_manager)
+    
     def reset(self):
         """Reset internal state."""
         self._state = {}
@@ -5,7 +5,7 @@ Cursor control gesture detector - controls mouse cursor in menu mode
 # moves by pixels gotta change later
 
 import sys
-import numpy as np
+import math
 from gestures.base_detector import BaseGestureDetector
 
 
@@ -174,8 +174,8 @@ class CursorControlDetector(BaseGestureDetector):
         Calculate Euclidean distance between two 3D points.
         
         Args:
-            pos1: (x, y, z) tuple for first position
-            pos2: (x, y, z) tuple for second position
+            pos1: [x, y, z] array for first position
+            pos2: [x, y, z] array for second position
         
         Returns:
             Float: Distance between points, or None if positions are invalid
@@ -183,30 +183,24 @@ class CursorControlDetector(BaseGestureDetector):
         if pos1 is None or pos2 is None:
             return None
         
-        dx = pos1[0] - pos2[0]
-        dy = pos1[1] - pos2[1]
-        dz = pos1[2] - pos2[2]
-        
-        return np.sqrt(dx**2 + dy**2 + dz**2)
+        return math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1], pos1[2] - pos2[2])
     
-    def _get_shoulder_width(self, state_manager):
+    def _get_shoulder_width(self, left_shoulder, right_shoulder):
         """
         Calculate shoulder width for scaling.
         
+        Args:
+            left_shoulder: numpy array [x, y, z] for the left shoulder (or None)
+            right_shoulder: numpy array [x, y, z] for the right shoulder (or None)
+        
         Returns:
             Float: Distance between shoulders, or None
         """
-        left_shoulder = state_manager.get_landmark_position('left_shoulder', frame_offset=0)
-        right_shoulder = state_manager.get_landmark_position('right_shoulder', frame_offset=0)
-        
         if left_shoulder is None or right_shoulder is None:
             return None
         
-        dx = right_shoulder[0] - left_shoulder[0]
-        dy = right_shoulder[1] - left_shoulder[1]
-        shoulder_width = np.sqrt(dx**2 + dy**2)
-        
-        return shoulder_width
+        return math.hypot(right_shoulder[0] - left_shoulder[0],
+                          right_shoulder[1] - left_shoulder[1])
     
     def _map_hand_to_screen(self, hand_pos, center_pos, shoulder_width):
         """
@@ -326,8 +320,9 @@ class CursorControlDetector(BaseGestureDetector):
         # - Wrist: right_wrist (from pose) or can use hand landmark 0
         # - Thumb tip: right_thumb_tip (landmark 4)
         # - Index finger tip: right_index_finger_tip (landmark 8)
-        right_thumb_tip = state_manager.get_landmark_position('right_thumb_tip', frame_offset=0)
-        right_index_tip = state_manager.get_landmark_position('right_index_finger_tip', frame_offset=0)
+        get_pos = state_manager.get_landmark_position
+        right_thumb_tip = get_pos('right_thumb_tip', 0)
+        right_index_tip = get_pos('right_index_finger_tip', 0)
         
         # Require both thumb tip and index tip for control
         if right_thumb_tip is None or right_index_tip is None:
@@ -336,7 +331,9 @@ class CursorControlDetector(BaseGestureDetector):
             return None
         
         # Get shoulder width for scaling
-        shoulder_width = self._get_shoulder_width(state_manager)
+        left_shoulder = get_pos('left_shoulder', 0)
+        right_shoulder = get_pos('right_shoulder', 0)
+        shoulder_width = self._get_shoulder_width(left_shoulder, right_shoulder)
         if shoulder_width is None:
             return None
         
@@ -349,10 +346,7 @@ class CursorControlDetector(BaseGestureDetector):
         # Cache shoulder width
         self._state['shoulder_width'] = shoulder_width
         
-        # Get right shoulder position to serve as dynamic center
-        right_shoulder = state_manager.get_landmark_position('right_shoulder', frame_offset=0)
-        if right_shoulder is None:
-            return None
+        # Right shoulder position serves as dynamic center
         center_pos = (float(right_shoulder[0]), float(right_shoulder[1]))
         if self._state['center_pos'] is None:
             self._state['center_pos'] = center_pos
@@ -361,12 +355,10 @@ class CursorControlDetector(BaseGestureDetector):
             self._state['center_pos'] = center_pos
         
         # Cursor controlled by midpoint between thumb tip and index tip
-        thumb_pos = tuple(right_thumb_tip)
-        index_pos = tuple(right_index_tip)
         controlling_pos = (
-            (thumb_pos[0] + index_pos[0]) / 2.0,
-            (thumb_pos[1] + index_pos[1]) / 2.0,
-            (thumb_pos[2] + index_pos[2]) / 2.0,
+            (right_thumb_tip[0] + right_index_tip[0]) / 2.0,
+            (right_thumb_tip[1] + right_index_tip[1]) / 2.0,
+            (right_thumb_tip[2] + right_index_tip[2]) / 2.0,
         )
 
         # Before mapping, ensure the wrist is inside the control rectangle
@@ -399,9 +391,7 @@ class CursorControlDetector(BaseGestureDetector):
             self._state['click_cooldown'] -= 1
         
         if right_thumb_tip is not None and right_index_tip is not None:
-            thumb_pos = tuple(right_thumb_tip)
-            index_pos = tuple(right_index_tip)
-            pinch_distance = self._calculate_distance(thumb_pos, index_pos)
+            pinch_distance = self._calculate_distance(right_thumb_tip, right_index_tip)
             # Normalize pinch distance by current shoulder width for scale invariance
             if shoulder_width is not None and shoulder_width > 1e-6 and pinch_distance is not None:
                 pinch_distance_normalized = pinch_distance / float(shoulder_width)
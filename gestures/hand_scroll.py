@@ -15,6 +15,7 @@ When the hand stays rotated beyond a threshold and remains open with arm vertica
 it continuously scrolls up or down every frame until the rotation returns near baseline.
 """
 
+import math
 import numpy as np
 from collections import deque
 from gestures.base_detector import BaseGestureDetector
@@ -29,6 +30,14 @@ SCROLL_SPEED = 1                # Reserved for future tuning
 INNER_DEAD_ZONE = 0.1           # Dead zone as a fraction of threshold (prevents micro drift)
 VERTICAL_ARM_THRESHOLD_MULT = 2  # Horizontal displacement threshold: |dx|/eye_width must be < this value
 
+# (fingertip, middle joint) hand landmark indices checked for an open hand
+FINGER_TIP_JOINT_PAIRS = (
+    (8, 6),    # Index finger
+    (12, 10),  # Middle finger
+    (16, 14),  # Ring finger
+    (20, 18),  # Pinky
+)
+
 
 class HandScrollDetector(BaseGestureDetector):
     """
@@ -132,7 +141,7 @@ class HandScrollDetector(BaseGestureDetector):
         landmark = hand_landmarks[index]
         return np.array([landmark['x'], landmark['y'], landmark['z']])
     
-    def _calculate_eye_width(self, state_manager):
+    def _calculate_eye_width(self, current_landmarks):
         """
         Calculate eye width using facial landmarks for scale normalization.
         
@@ -141,15 +150,11 @@ class HandScrollDetector(BaseGestureDetector):
         - Right eye outer canthus: landmark 263
         
         Args:
-            state_manager: GestureStateManager instance
+            current_landmarks: Landmark dictionary for the current frame
         
         Returns:
             Float representing eye width, or None if landmarks unavailable
         """
-        if len(state_manager.landmark_history) == 0:
-            return None
-        
-        current_landmarks = state_manager.landmark_history[-1]
         face_landmarks = current_landmarks.get('face')
         
         if face_landmarks is None or len(face_landmarks) < 264:
@@ -159,11 +164,9 @@ class HandScrollDetector(BaseGestureDetector):
         left_eye_outer = face_landmarks[33]
         right_eye_outer = face_landmarks[263]
         
-        left_pos = np.array([left_eye_outer['x'], left_eye_outer['y'], left_eye_outer['z']])
-        right_pos = np.array([right_eye_outer['x'], right_eye_outer['y'], right_eye_outer['z']])
-        
-        # Calculate Euclidean distance in XY plane
-        eye_width = np.linalg.norm(left_pos[:2] - right_pos[:2])
+        # Calculate Euclidean distance in XY plane on plain floats
+        eye_width = math.hypot(left_eye_outer['x'] - right_eye_outer['x'],
+                               left_eye_outer['y'] - right_eye_outer['y'])
         
         return eye_width if eye_width > 1e-6 else None
     
@@ -194,15 +197,7 @@ class HandScrollDetector(BaseGestureDetector):
             return False
         
         # Check if each fingertip is above its middle joint
-        # Landmark indices: tip, middle_joint
-        finger_checks = [
-            (8, 6),   # Index finger
-            (12, 10), # Middle finger
-            (16, 14), # Ring finger
-            (20, 18), # Pinky
-        ]
-        
-        for tip_idx, joint_idx in finger_checks:
+        for tip_idx, joint_idx in FINGER_TIP_JOINT_PAIRS:
             tip = hand_landmarks[tip_idx]
             joint = hand_landmarks[joint_idx]
             
@@ -275,6 +270,24 @@ class HandScrollDetector(BaseGestureDetector):
         Args:
             state_manager: GestureStateManager instance
         
+        Returns:
+            See detect_frame()
+        """
+        # Check if we have landmark history
+        if len(state_manager.landmark_history) == 0:
+            print("[HAND_SCROLL DEBUG] ⚠️  No landmark history")
+            return None
+        
+        return self.detect_frame(state_manager.landmark_history[-1], state_manager)
+    
+    def detect_frame(self, current_landmarks, state_manager):
+        """
+        Detect hand rotation from the current frame's landmarks.
+        
+        Args:
+            current_landmarks: Landmark dictionary for the current frame
+            state_manager: GestureStateManager instance
+        
         Returns:
             Dictionary with scroll info:
             {
@@ -290,16 +303,13 @@ class HandScrollDetector(BaseGestureDetector):
             print("[HAND_SCROLL DEBUG] ⚠️  Detector disabled")
             return None
         
-        # Check if we have landmark history
-        if len(state_manager.landmark_history) == 0:
-            print("[HAND_SCROLL DEBUG] ⚠️  No landmark history")
+        if current_landmarks is None:
             return None
         
-        current_landmarks = state_manager.landmark_history[-1]
         print(f"[HAND_SCROLL DEBUG] 🔍 Processing frame, landmarks available")
         
         # Calculate eye width for scale normalization
-        eye_width = self._calculate_eye_width(state_manager)
+        eye_width = self._calculate_eye_width(current_landmarks)
         if eye_width is None:
             return None
         
@@ -2,6 +2,7 @@
 Inventory gesture detector - detects inventory open gesture
 """
 
+import math
 import numpy as np
 from gestures.base_detector import BaseGestureDetector
 
@@ -34,44 +35,35 @@ class InventoryDetector(BaseGestureDetector):
             'cooldown_counter': 0,        # Frames since last gesture completion
         }
     
-    def _get_shoulder_width(self, state_manager):
+    def _get_shoulder_width(self, left_shoulder, right_shoulder):
         """
         Calculate the distance between left and right shoulders.
         
         Args:
-            state_manager: GestureStateManager instance
+            left_shoulder: numpy array [x, y, z] for the left shoulder (or None)
+            right_shoulder: numpy array [x, y, z] for the right shoulder (or None)
         
         Returns:
             Float: Distance between shoulders, or None if positions unavailable
         """
-        left_shoulder = state_manager.get_landmark_position('left_shoulder', frame_offset=0)
-        right_shoulder = state_manager.get_landmark_position('right_shoulder', frame_offset=0)
-        
         if left_shoulder is None or right_shoulder is None:
             return None
         
         # Calculate Euclidean distance in x-y plane (ignore z for shoulder width)
-        dx = right_shoulder[0] - left_shoulder[0]
-        dy = right_shoulder[1] - left_shoulder[1]
-        shoulder_width = np.sqrt(dx**2 + dy**2)
-        
-        return shoulder_width
+        return math.hypot(right_shoulder[0] - left_shoulder[0],
+                          right_shoulder[1] - left_shoulder[1])
     
-    def _get_normalized_velocity(self, state_manager):
+    def _get_normalized_velocity(self, state_manager, shoulder_width):
         """
         Calculate the velocity of the left wrist normalized by shoulder width.
         
         Args:
             state_manager: GestureStateManager instance
+            shoulder_width: Current shoulder width used for normalization
         
         Returns:
             Tuple of (velocity_x, velocity_magnitude) normalized by shoulder width, or (None, None)
         """
-        # Get shoulder width for normalization
-        shoulder_width = self._get_shoulder_width(state_manager)
-        if shoulder_width is None:
-            return None, None
-        
         # Get velocity of left wrist
         velocity = state_manager.get_velocity('left_wrist', window_size=self.velocity_window_size)
         if velocity is None:
@@ -84,38 +76,6 @@ class InventoryDetector(BaseGestureDetector):
         
         return velocity_x, velocity_magnitude
     
-    def _get_x_displacement(self, state_manager):
-        """
-        Calculate the displacement in x direction over the displacement window,
-        normalized by shoulder width.
-        
-        Args:
-            state_manager: GestureStateManager instance
-        
-        Returns:
-            Float: x displacement normalized by shoulder width, or None
-        """
-        # Check if we have enough history
-        if len(state_manager.landmark_history) < self.displacement_window_size:
-            return None
-        
-        # Get shoulder width for normalization
-        shoulder_width = self._get_shoulder_width(state_manager)
-        if shoulder_width is None:
-            return None
-        
-        # Get current and past positions
-        current_pos = state_manager.get_landmark_position('left_wrist', frame_offset=0)
-        past_pos = state_manager.get_landmark_position('left_wrist', frame_offset=self.displacement_window_size - 1)
-        
-        if current_pos is None or past_pos is None:
-            return None
-        
-        # Calculate x displacement (normalized by shoulder width)
-        x_displacement = (current_pos[0] - past_pos[0]) / shoulder_width
-        
-        return x_displacement
-    
     def detect(self, state_manager):
         """
         Detect inventory open gesture from left hand velocity and displacement.
@@ -136,8 +96,18 @@ class InventoryDetector(BaseGestureDetector):
             self._state['cooldown_counter'] -= 1
             return None
         
+        # Fetch the landmarks used this frame once
+        get_pos = state_manager.get_landmark_position
+        left_shoulder = get_pos('left_shoulder', 0)
+        right_shoulder = get_pos('right_shoulder', 0)
+        left_wrist = get_pos('left_wrist', 0)
+        
+        shoulder_width = self._get_shoulder_width(left_shoulder, right_shoulder)
+        if shoulder_width is None:
+            return None
+        
         # Get normalized velocity
-        velocity_x, velocity_magnitude = self._get_normalized_velocity(state_manager)
+        velocity_x, velocity_magnitude = self._get_normalized_velocity(state_manager, shoulder_width)
         
         if velocity_x is None or velocity_magnitude is None:
             return None
@@ -156,9 +126,12 @@ class InventoryDetector(BaseGestureDetector):
             return None
         
         # Check displacement requirement
-        x_displacement = self._get_x_displacement(state_manager)
-        if x_displacement is None:
+        if left_wrist is None or len(state_manager.landmark_history) < self.displacement_window_size:
+            return None
+        past_wrist = get_pos('left_wrist', self.displacement_window_size - 1)
+        if past_wrist is None:
             return None
+        x_displacement = (left_wrist[0] - past_wrist[0]) / shoulder_width
         
         # For left-to-right swipe (as seen by user), we need negative displacement in MediaPipe coords
         # The displacement must exceed the minimum threshold
@@ -169,8 +142,6 @@ class InventoryDetector(BaseGestureDetector):
         # Velocity and displacement are both sufficient and direction is correct!
         self._state['cooldown_counter'] = self.cooldown_frames
         
-        shoulder_width = self._get_shoulder_width(state_manager)
-        
         return {
             'action': 'inventory_open',
             'velocity_x': velocity_x,
@@ -2,7 +2,9 @@
 Looking gesture detector - controls mouse by rotating head left/right
 """
 
-import numpy as np
+import math
+import operator
+
 from gestures.base_detector import BaseGestureDetector
 
 
@@ -40,31 +42,38 @@ class LookingDetector(BaseGestureDetector):
         self.right_edge = 356  # Right face edge
         self.right_eye_outer = 263  # Right eye outer canthus
         
+        # Gather all four landmarks from the face list in one call
+        self._face_getter = operator.itemgetter(
+            self.left_edge, self.left_eye_outer, self.right_edge, self.right_eye_outer
+        )
+        
+        # Debug mode: when enabled, every frame returns the full set of distances
+        # and ratios for the HUD; otherwise idle frames return None
+        self.debug = False
+        self._result_buf = {'action': 'head_look'}  # Reused across frames in debug mode
+        
         # State tracking
         self._state = {
             'last_dx': 0,  # Last mouse movement for smoothing
         }
     
-    def _get_face_landmark(self, landmarks_dict, index):
+    def _get_face_landmarks(self, landmarks_dict):
         """
-        Get a specific face landmark by index.
+        Get the four face landmarks used for head rotation.
         
         Args:
             landmarks_dict: Landmark dictionary from state manager
-            index: Face landmark index (0-467)
         
         Returns:
-            numpy array [x, y, z] or None if not available
+            Tuple of landmark dicts (left_edge, left_eye_outer, right_edge,
+            right_eye_outer), or None if not available
         """
-        if landmarks_dict is None:
-            return None
-        
-        face_landmarks = landmarks_dict.get('face')
-        if face_landmarks is None or len(face_landmarks) <= index:
+        # Face is normally present, so skip the upfront checks and treat a
+        # missing frame/face list or short list as the rare failure case
+        try:
+            return self._face_getter(landmarks_dict['face'])
+        except (IndexError, KeyError, TypeError):
             return None
-        
-        landmark = face_landmarks[index]
-        return np.array([landmark['x'], landmark['y'], landmark['z']])
     
     def _calculate_x_distance(self, pos1, pos2):
         """
@@ -72,17 +81,14 @@ class LookingDetector(BaseGestureDetector):
         Head rotation primarily affects the horizontal spacing.
         
         Args:
-            pos1: numpy array [x, y, z]
-            pos2: numpy array [x, y, z]
+            pos1: Face landmark dict with 'x', 'y', 'z'
+            pos2: Face landmark dict with 'x', 'y', 'z'
         
         Returns:
-            Float: Absolute X distance between points, or None if positions are invalid
+            Float: Absolute X distance between points
         """
-        if pos1 is None or pos2 is None:
-            return None
-        
         # Use only X coordinate (horizontal distance)
-        return abs(pos1[0] - pos2[0])
+        return math.fabs(pos1['x'] - pos2['x'])
     
     def _calculate_y_distance(self, pos1, pos2):
         """
@@ -90,21 +96,17 @@ class LookingDetector(BaseGestureDetector):
         Head tilt up/down primarily affects the vertical spacing.
         
         Args:
-            pos1: numpy array [x, y, z] - face edge position
-            pos2: numpy array [x, y, z] - eye canthus position
+            pos1: Face landmark dict - face edge position
+            pos2: Face landmark dict - eye canthus position
         
         Returns:
             Float: Signed Y distance (pos2 Y - pos1 Y)
             - Positive = canthus is BELOW face edge (head tilted down)
             - Negative = canthus is ABOVE face edge (head tilted up)
-            Or None if positions are invalid
         """
-        if pos1 is None or pos2 is None:
-            return None
-        
         # Use only Y coordinate (signed distance)
         # In image coordinates, Y increases downward
-        return pos2[1] - pos1[1]
+        return pos2['y'] - pos1['y']
     
     def detect(self, state_manager):
         """
@@ -113,42 +115,47 @@ class LookingDetector(BaseGestureDetector):
         Args:
             state_manager: GestureStateManager instance
         
+        Returns:
+            See detect_frame()
+        """
+        if len(state_manager.landmark_history) == 0:
+            return None
+        
+        return self.detect_frame(state_manager.landmark_history[-1], state_manager)
+    
+    def detect_frame(self, current_landmarks, state_manager):
+        """
+        Detect head rotation from the current frame's landmarks.
+        
+        Args:
+            current_landmarks: Landmark dictionary for the current frame
+            state_manager: GestureStateManager instance
+        
         Returns:
             Dictionary with mouse movement:
             {
                 'action': 'head_look',
                 'dx': horizontal_movement,  # Positive = right, negative = left
-                'dy': 0  # No vertical movement for now
+                'dy': vertical_movement  # Positive = down, negative = up
             }
-            or None if no significant rotation detected
+            or None if no significant rotation detected. With debug enabled,
+            the dict is returned every frame and also carries the distances
+            and ratios used for the decision.
         """
-        if not self.enabled:
-            return None
-        
-        # Get current frame landmarks
-        if len(state_manager.landmark_history) == 0:
+        if not self.enabled or current_landmarks is None:
             return None
         
-        current_landmarks = state_manager.landmark_history[-1]
-        
         # Get the four key facial landmarks
-        left_edge_pos = self._get_face_landmark(current_landmarks, self.left_edge)
-        left_eye_pos = self._get_face_landmark(current_landmarks, self.left_eye_outer)
-        right_edge_pos = self._get_face_landmark(current_landmarks, self.right_edge)
-        right_eye_pos = self._get_face_landmark(current_landmarks, self.right_eye_outer)
-        
-        # Check if all landmarks are available
-        if any(pos is None for pos in [left_edge_pos, left_eye_pos, right_edge_pos, right_eye_pos]):
+        face_points = self._get_face_landmarks(current_landmarks)
+        if face_points is None:
             return None
+        left_edge_pos, left_eye_pos, right_edge_pos, right_eye_pos = face_points
         
         # === HORIZONTAL CONTROL (Left/Right) ===
         # Calculate X distances on each side
         left_x_distance = self._calculate_x_distance(left_edge_pos, left_eye_pos)
         right_x_distance = self._calculate_x_distance(right_edge_pos, right_eye_pos)
         
-        if left_x_distance is None or right_x_distance is None:
-            return None
-        
         # Avoid division by zero
         if left_x_distance < 1e-6 or right_x_distance < 1e-6:
             return None
@@ -158,20 +165,15 @@ class LookingDetector(BaseGestureDetector):
         right_to_left_ratio = right_x_distance / left_x_distance
         
         # Determine horizontal mouse movement based on ratio
-        dx = 0
         threshold_value = self.tilt_multiplier + self.deadzone
         
-        # Head tilted right (left distance > right distance)
-        # When you turn your head right, the left side of your face is more visible
-        if left_to_right_ratio > threshold_value:
-            # Move mouse left (inverted for natural feel)
-            dx = -self.mouse_speed
-        
-        # Head tilted left (right distance > left distance)
-        # When you turn your head left, the right side of your face is more visible
-        elif right_to_left_ratio > threshold_value:
-            # Move mouse right (inverted for natural feel)
-            dx = self.mouse_speed
+        # Head tilted right (left distance > right distance): move mouse left
+        # Head tilted left (right distance > left distance): move mouse right
+        # (inverted for natural feel). The two tests are mutually exclusive since
+        # threshold_value > 1, so the difference is always -1, 0 or +1.
+        turned_right = left_to_right_ratio > threshold_value
+        turned_left = right_to_left_ratio > threshold_value
+        dx = (int(turned_left) - int(turned_right)) * self.mouse_speed
         
         # === VERTICAL CONTROL (Up/Down) ===
         # Calculate SIGNED Y distances on each side
@@ -184,19 +186,18 @@ class LookingDetector(BaseGestureDetector):
         avg_y_distance = (left_y_distance + right_y_distance) / 2.0
         
         # Determine vertical mouse movement based on shoulder-normalized average Y distance
-        dy = 0
-
         # Compute shoulder distance for scale normalization (pose landmarks 11 and 12)
         # Use state_manager to fetch named pose landmarks ('left_shoulder', 'right_shoulder')
-        left_shoulder = state_manager.get_landmark_position('left_shoulder')
-        right_shoulder = state_manager.get_landmark_position('right_shoulder')
+        get_pos = state_manager.get_landmark_position
+        left_shoulder = get_pos('left_shoulder', 0)
+        right_shoulder = get_pos('right_shoulder', 0)
 
         shoulder_distance = None
         avg_y_normalized = None
         if left_shoulder is not None and right_shoulder is not None:
             # Euclidean distance in image-normalized XY space
-            shoulder_vec = left_shoulder[:2] - right_shoulder[:2]
-            shoulder_distance = float(np.linalg.norm(shoulder_vec))
+            shoulder_distance = math.hypot(float(left_shoulder[0]) - float(right_shoulder[0]),
+                                           float(left_shoulder[1]) - float(right_shoulder[1]))
             if shoulder_distance > 1e-6:
                 avg_y_normalized = avg_y_distance / shoulder_distance
 
@@ -206,40 +207,39 @@ class LookingDetector(BaseGestureDetector):
         y_threshold_value = self.y_threshold
 
         # Head tilted UP: requires threshold (canthus significantly ABOVE face edge)
-        if value_for_threshold < -y_threshold_value:
-            # Negative = canthus ABOVE face edge = head tilted UP
-            # Move mouse up (negative Y in screen coordinates)
-            dy = -self.mouse_speed
-
         # Head tilted DOWN: any amount below triggers (canthus BELOW face edge)
-        elif value_for_threshold > 0:
-            # Positive = canthus BELOW face edge = head tilted DOWN
-            # Move mouse down (positive Y in screen coordinates)
-            dy = self.mouse_speed
+        # Negative dy moves the mouse up in screen coordinates, positive moves it down.
+        tilted_up = value_for_threshold < -y_threshold_value
+        tilted_down = value_for_threshold > 0
+        dy = (int(tilted_down) - int(tilted_up)) * self.mouse_speed
         
         # Store for smoothing (optional future enhancement)
         self._state['last_dx'] = dx
         
-        # Always return data for debug display (even when dx/dy is 0)
-        # This allows the HUD to show distances and ratios for tuning
+        if not self.debug:
+            # Idle frames produce nothing; active frames only need the movement
+            if dx == 0 and dy == 0:
+                return None
+            return {'action': 'head_look', 'dx': dx, 'dy': dy}
+        
+        # Debug mode: return data for the HUD every frame (even when dx/dy is 0)
+        # so distances and ratios can be tuned. Filled in place to avoid
+        # building a new dict per frame.
+        result = self._result_buf
+        result['dx'] = dx
+        result['dy'] = dy
+        result['left_x_distance'] = left_x_distance
+        result['right_x_distance'] = right_x_distance
+        result['left_y_distance'] = left_y_distance
+        result['right_y_distance'] = right_y_distance
+        result['avg_y_distance'] = avg_y_distance
+        result['avg_y_distance_normalized'] = avg_y_normalized if avg_y_normalized is not None else avg_y_distance
+        result['shoulder_distance'] = shoulder_distance if shoulder_distance is not None else 0.0
         # Show the maximum ratio for easier debugging
-        max_x_ratio = max(left_to_right_ratio, right_to_left_ratio)
-        
-        return {
-            'action': 'head_look',
-            'dx': dx,
-            'dy': dy,
-            'left_x_distance': left_x_distance,
-            'right_x_distance': right_x_distance,
-            'left_y_distance': left_y_distance,
-            'right_y_distance': right_y_distance,
-            'avg_y_distance': avg_y_distance,
-            'avg_y_distance_normalized': avg_y_normalized if avg_y_normalized is not None else avg_y_distance,
-            'shoulder_distance': shoulder_distance if shoulder_distance is not None else 0.0,
-            'x_ratio': max_x_ratio,
-            'left_to_right_ratio': left_to_right_ratio,
-            'right_to_left_ratio': right_to_left_ratio
-        }
+        result['x_ratio'] = max(left_to_right_ratio, right_to_left_ratio)
+        result['left_to_right_ratio'] = left_to_right_ratio
+        result['right_to_left_ratio'] = right_to_left_ratio
+        return result
     
     def reset(self):
         """Reset detector state."""
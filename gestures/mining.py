@@ -2,9 +2,59 @@
 Mining gesture detector - detects vertical stabbing motions for continuous mining
 """
 
-import time
+from math import isnan, nan
+
 import numpy as np
+from gestures import _mining_kernels
+from gestures._mining_kernels import (
+    Action, _NO_TIME, _hand_scale, _is_vertical_stab, _low_pass, _mining_step,
+    _normalized_velocity, _point_distance, _polygon_area, _update_oscillation,
+)
 from gestures.base_detector import BaseGestureDetector
+from utils.state_manager import LANDMARK_NAME_TO_ID
+
+
+# Pose landmarks read every frame, fetched as one batch (row order is relied on)
+_POSE_NAMES = ('right_wrist', 'right_shoulder', 'left_shoulder')
+
+# Right-hand fingertips outlining the spread polygon
+_FINGERTIP_NAMES = (
+    'right_thumb_tip',
+    'right_index_finger_tip',
+    'right_middle_finger_tip',
+    'right_ring_finger_tip',
+    'right_pinky_tip',
+)
+
+# Landmarks used for the hand scale, and (start, end) index pairs into that
+# tuple whose distances are combined (wrist to each knuckle, index to pinky knuckle)
+_HAND_SCALE_NAMES = (
+    'right_wrist',
+    'right_index_finger_mcp',
+    'right_middle_finger_mcp',
+    'right_ring_finger_mcp',
+    'right_pinky_mcp',
+)
+_HAND_SCALE_PAIRS = np.array([[0, 1], [0, 2], [0, 3], [0, 4], [1, 4]])
+
+# Hand landmarks are fetched together: fingertip rows first, then hand-scale rows
+_NUM_FINGERTIPS = len(_FINGERTIP_NAMES)
+_HAND_NAMES = _FINGERTIP_NAMES + _HAND_SCALE_NAMES
+
+# (group, index) IDs for the names above, resolved once so per-frame
+# lookups index the landmark lists directly instead of scanning by name
+_POSE_IDS = tuple(LANDMARK_NAME_TO_ID[name] for name in _POSE_NAMES)
+_HAND_IDS = tuple(LANDMARK_NAME_TO_ID[name] for name in _HAND_NAMES)
+_RIGHT_WRIST_ID = _POSE_IDS[0]
+
+
+# Shared, read-only action results indexed by Action (callers must not mutate them)
+_ACTION_RESULTS = (
+    None,
+    {'action': 'mining_start_hold'},
+    {'action': 'mining_continue_hold'},
+    {'action': 'mining_stop_hold'},
+)
 
 
 class MiningDetector(BaseGestureDetector):
@@ -18,8 +68,13 @@ class MiningDetector(BaseGestureDetector):
     - Holds down left click while vertical motion continues
     - Uses hand spread detection to distinguish mining (closed fist) from placing (open hand)
     - Gated: right wrist must be above right shoulder for any mining detection/hold
+    
+    Returned action dicts are shared module-level constants; callers must
+    treat them as read-only.
     """
     
+    _kernels = _mining_kernels
+    
     def __init__(self):
         super().__init__("mining")
         
@@ -38,6 +93,10 @@ class MiningDetector(BaseGestureDetector):
         # Default: 6 frames (increase to 7-10 for smoother, less sensitive detection)
         self.velocity_window_frames = 6
         
+        # Low-pass filter on normalized wrist velocity before thresholding
+        # Default: 0.4 (~3-frame time constant; 1.0 disables filtering)
+        self.velocity_filter_alpha = 0.4
+        
         # Grace period: Time to maintain hold without vertical motion
         # Default: 0.26 seconds (increase to 0.6 for more forgiving detection)
         self.hold_grace_period = 0.5
@@ -45,13 +104,55 @@ class MiningDetector(BaseGestureDetector):
         # Hand spread thresholds for distinguishing mining vs placing
         self.open_hand_area_threshold = 0.55    # Above this = open hand (placing)
         self.closed_hand_area_threshold = 0.45  # Below this = closed fist (mining)
+        
+        # Idle decimation: while not holding, run the full analysis only every Nth
+        # frame (a stab spans several frames of the velocity window; 1 = every frame)
+        self.idle_decimation = 2
+        
+        # Hand and shoulder scale change slowly, so only re-measure them every N frames
+        self.hand_scale_refresh_frames = 5
+        self.shoulder_scale_refresh_frames = 5
+        
+        # Oscillation (continued pumping) detection on normalized Y velocity
+        self.oscillation_alpha = 0.2           # EMA smoothing factor for mean/variance
+        self.oscillation_gain = 0.5            # Peak must deviate by this many std devs...
+        self.oscillation_min_amplitude = 0.5   # ...and at least this much
+        self.oscillation_window = 0.5          # Two peaks within this many seconds = oscillating
         # ==================================================================
         
+        # Squared stab thresholds so the per-frame test needs no abs
+        self._y_velocity_threshold_sq = float(self.y_velocity_threshold) ** 2
+        self._x_velocity_threshold_sq = float(self.x_velocity_threshold) ** 2
+        
+        # Squared peak thresholds so the per-frame envelope test needs no sqrt
+        self._oscillation_gain_sq = self.oscillation_gain ** 2
+        self._oscillation_min_amplitude_sq = self.oscillation_min_amplitude ** 2
+        
+        # Timeouts as integer nanoseconds for comparison with state_manager.current_time_ns
+        self._hold_grace_period_ns = int(self.hold_grace_period * 1e9)
+        self._oscillation_window_ns = int(self.oscillation_window * 1e9)
+        
         # State tracking
-        self._state = {
-            'is_holding': False,           # Whether currently holding left click
-            'last_motion_time': None,      # Time of last detected vertical motion
-        }
+        self._is_holding = False           # Whether currently holding left click
+        self._idle_frame_counter = 0       # Frames seen while idle, for decimation
+        self._last_motion_time = _NO_TIME  # monotonic_ns of last detected vertical motion
+        
+        # Reusable position buffers, filled in place every frame so the hot
+        # path allocates no arrays. All are C-contiguous with one [x, y, z]
+        # row per landmark, the layout the kernels index directly. Pose rows
+        # stay float64 for the velocity difference; the hand rows only feed
+        # the area/scale ratio, so float32 halves what the kernels read.
+        self._pose_buf = np.empty((len(_POSE_NAMES), 3))
+        self._past_wrist_buf = np.empty(3)
+        self._hand_buf = np.empty((len(_HAND_NAMES), 3), dtype=np.float32)
+        
+        # Cached hand scale and 1 / shoulder distance, each with the state
+        # manager frame it was measured on
+        self._invalidate_scale_cache()
+        
+        # Online oscillation detector and velocity filter state
+        self._reset_oscillation()
+        self._reset_velocity_filter()
     
     def detect(self, state_manager):
         """
@@ -67,102 +168,142 @@ class MiningDetector(BaseGestureDetector):
             - {'action': 'mining_stop_hold'} - Stop mining
             - None - No mining detected
         """
+        return _ACTION_RESULTS[self.detect_code(state_manager)]
+    
+    def detect_code(self, state_manager):
+        """
+        Detect mining gesture and return an integer action code.
+        
+        Same logic as detect() without building a result dict, for callers
+        that can dispatch on the code directly.
+        
+        Args:
+            state_manager: GestureStateManager instance
+        
+        Returns:
+            Action code (Action.NONE when nothing is detected)
+        """
         if not self.enabled:
-            return None
+            return Action.NONE
 
-        # Gate: require right wrist above right shoulder to listen for mining
-        right_wrist_pos = state_manager.get_landmark_position('right_wrist')
-        right_shoulder_pos = state_manager.get_landmark_position('right_shoulder')
+        # While idle, skip the analysis on decimated frames
+        if self._is_holding:
+            self._idle_frame_counter = 0
+        else:
+            self._idle_frame_counter += 1
+            if self._idle_frame_counter % self.idle_decimation:
+                return Action.NONE
 
-        if right_wrist_pos is None or right_shoulder_pos is None:
+        # Bind the clock and hold flag once for this frame
+        current_time = state_manager.current_time_ns
+        is_holding = self._is_holding
+
+        # Fetch the pose landmarks used this frame in one pass
+        batch = state_manager.get_landmarks_by_id(_POSE_IDS, out=self._pose_buf)
+        if batch is None:
+            return self._handle_tracking_lost()
+        pose, pose_valid = batch
+        if not (pose_valid[0] and pose_valid[1]):
             return self._handle_tracking_lost()
+        right_wrist_pos = pose[0]
+        right_shoulder_pos = pose[1]
+        left_shoulder_pos = pose[2] if pose_valid[2] else None
 
+        # Gate: require right wrist above right shoulder to listen for mining
         wrist_above_shoulder = float(right_wrist_pos[1]) < float(right_shoulder_pos[1])
 
         if not wrist_above_shoulder:
+            # Filter restarts fresh when the wrist comes back above the shoulder
+            # (only needs clearing on the first frame below it)
+            if not isnan(self._vy_lp):
+                self._reset_velocity_filter()
             # If we were holding, stop immediately; otherwise, ignore gesture
-            if self._state['is_holding']:
-                self._state['is_holding'] = False
-                self._state['last_motion_time'] = None
-                return {'action': 'mining_stop_hold'}
-            return None
+            if is_holding:
+                return self._stop_hold()
+            return Action.NONE
 
-        # Get velocity of right wrist
-        velocity_vector = state_manager.get_velocity(
-            'right_wrist',
-            window_size=self.velocity_window_frames
+        # Get velocity of right wrist over the window, reusing the current
+        # wrist position fetched above (same result as state_manager.get_velocity)
+        window = self.velocity_window_frames
+        past_wrist_pos = state_manager.get_landmark_position_by_id(
+            _RIGHT_WRIST_ID, window - 1, out=self._past_wrist_buf
         )
-        
-        if velocity_vector is None:
+        if past_wrist_pos is None:
             return self._handle_tracking_lost()
         
-        # Check hand spread to distinguish mining (closed fist) from placing (open hand)
+        # Get (cached) inverse shoulder distance for normalization
+        inv_shoulder_distance = self._get_inv_shoulder_distance(
+            state_manager, left_shoulder_pos, right_shoulder_pos
+        )
+        shoulder_valid = inv_shoulder_distance is not None
+        
+        is_vertical_stab = False
+        is_oscillating = False
+        if shoulder_valid:
+            # Normalize velocity by shoulder distance for scale-invariance
+            x_velocity, y_velocity = _normalized_velocity(
+                right_wrist_pos, past_wrist_pos,
+                1.0 / (state_manager.dt * (window - 1)), inv_shoulder_distance
+            )
+            
+            # Smooth out pose jitter before comparing against the stab thresholds
+            alpha = float(self.velocity_filter_alpha)
+            self._vx_lp = _low_pass(x_velocity, self._vx_lp, alpha)
+            self._vy_lp = _low_pass(y_velocity, self._vy_lp, alpha)
+            is_vertical_stab = _is_vertical_stab(
+                self._vx_lp, self._vy_lp,
+                self._y_velocity_threshold_sq, self._x_velocity_threshold_sq
+            )
+            is_oscillating = self._update_oscillation_state(y_velocity, current_time)
+        
+        # Nothing can start or stop while idle without a stab, so skip the
+        # hand spread check on those frames
+        if not is_holding and not is_vertical_stab:
+            return Action.NONE
+        
+        # Check hand spread to distinguish mining (closed fist) from placing (open hand);
+        # the step kernel folds this into its single event classification
         hand_spread = self._get_hand_spread_area(state_manager)
-        hand_is_open = False
-        if hand_spread is not None:
-            hand_is_open = hand_spread >= self.open_hand_area_threshold
-        
-        # If hand is open and we're holding, stop mining
-        if self._state['is_holding'] and hand_is_open:
-            self._state['is_holding'] = False
-            self._state['last_motion_time'] = None
-            return {'action': 'mining_stop_hold'}
-        
-        # Ignore if hand is open (this is placing gesture, not mining)
-        if hand_is_open:
-            return None
+        hand_is_open = hand_spread is not None and hand_spread >= self.open_hand_area_threshold
         
-        # Get shoulder distance for normalization
-        shoulder_distance = self._get_shoulder_distance(state_manager)
-        
-        if shoulder_distance is None or shoulder_distance < 1e-5:
-            return None
-        
-        # Normalize velocity by shoulder distance for scale-invariance
-        normalized_velocity = velocity_vector / shoulder_distance
-        
-        # Extract x and y components
-        x_velocity = abs(normalized_velocity[0])  # Absolute x-axis speed
-        y_velocity = abs(normalized_velocity[1])  # Absolute y-axis speed
-        
-        # Check if movement is primarily vertical and fast enough
-        is_vertical_stab = (
-            y_velocity > self.y_velocity_threshold and
-            x_velocity < self.x_velocity_threshold
+        action_code, self._is_holding, self._last_motion_time = _mining_step(
+            is_vertical_stab, shoulder_valid, hand_is_open, is_oscillating, is_holding,
+            self._last_motion_time, current_time, self._hold_grace_period_ns
         )
         
-        current_time = time.time()
+        # The kernel returns a plain integer; wrap it so every path returns an Action
+        return Action(action_code)
+    
+    def _update_oscillation_state(self, y_velocity, current_time):
+        """
+        Feed one normalized Y velocity sample to the EMA peak detector.
         
-        if is_vertical_stab:
-            # Vertical stabbing motion detected
-            self._state['last_motion_time'] = current_time
-            
-            if not self._state['is_holding']:
-                # Start holding
-                self._state['is_holding'] = True
-                return {'action': 'mining_start_hold'}
-            else:
-                # Continue holding
-                return {'action': 'mining_continue_hold'}
-        
-        # No vertical motion detected
-        if self._state['is_holding']:
-            # Check if we should stop holding (grace period expired)
-            last_motion_time = self._state['last_motion_time']
-            
-            if last_motion_time is not None:
-                time_since_motion = current_time - last_motion_time
-                
-                if time_since_motion <= self.hold_grace_period:
-                    # Still within grace period, continue holding
-                    return {'action': 'mining_continue_hold'}
-            
-            # Grace period expired, stop holding
-            self._state['is_holding'] = False
-            self._state['last_motion_time'] = None
-            return {'action': 'mining_stop_hold'}
+        Returns:
+            bool: True if two opposite-sign peaks occurred within oscillation_window
+        """
+        self._osc_mean, self._osc_var, self._osc_sign, is_peak = _update_oscillation(
+            y_velocity, self._osc_mean, self._osc_var, self._osc_sign,
+            self.oscillation_alpha, self._oscillation_gain_sq, self._oscillation_min_amplitude_sq
+        )
+        if is_peak:
+            self._prev_peak_time = self._last_peak_time
+            self._last_peak_time = current_time
         
-        return None
+        return (self._prev_peak_time != _NO_TIME
+                and current_time - self._prev_peak_time <= self._oscillation_window_ns)
+    
+    def _reset_oscillation(self):
+        """Clear the oscillation detector."""
+        self._osc_mean = nan
+        self._osc_var = 0.0
+        self._osc_sign = 0.0
+        self._prev_peak_time = _NO_TIME
+        self._last_peak_time = _NO_TIME
+    
+    def _reset_velocity_filter(self):
+        """Clear the low-pass velocity filter so it reseeds on the next sample."""
+        self._vx_lp = nan
+        self._vy_lp = nan
     
     def _get_hand_spread_area(self, state_manager):
         """
@@ -171,92 +312,146 @@ class MiningDetector(BaseGestureDetector):
         Returns:
             float or None: Normalized area (size-invariant), None if landmarks missing.
         """
-        fingertip_names = [
-            'right_thumb_tip',
-            'right_index_finger_tip',
-            'right_middle_finger_tip',
-            'right_ring_finger_tip',
-            'right_pinky_tip',
-        ]
-        
-        points = []
-        for name in fingertip_names:
-            pos = state_manager.get_landmark_position(name)
-            if pos is None:
-                return None
-            points.append((float(pos[0]), float(pos[1])))
-        
-        raw_area = self._polygon_area(points)
-        hand_scale = self._get_hand_scale(state_manager)
-        if hand_scale is None:
+        features = self._get_hand_features(state_manager)
+        if features is None:
             return None
         
+        raw_area, hand_scale = features
         return float(raw_area / max(hand_scale ** 2, 1e-6))
     
-    @staticmethod
-    def _polygon_area(points):
-        """Compute area via shoelace formula."""
-        area = 0.0
-        count = len(points)
-        for i in range(count):
-            x1, y1 = points[i]
-            x2, y2 = points[(i + 1) % count]
-            area += x1 * y2 - x2 * y1
-        return abs(area) * 0.5
+    def _get_hand_features(self, state_manager):
+        """
+        Measure fingertip spread area and hand scale from one landmark fetch.
+        
+        Returns:
+            (raw_area, hand_scale) tuple, or None if landmarks are missing
+        """
+        # Fingertips and wrist/knuckles go into the reusable hand buffer together
+        batch = state_manager.get_landmarks_by_id(_HAND_IDS, out=self._hand_buf)
+        if batch is None:
+            return None
+        positions, valid = batch
+        if not valid[:_NUM_FINGERTIPS].all():
+            return None
+        
+        hand_scale = self._get_hand_scale(
+            state_manager, positions[_NUM_FINGERTIPS:], valid[_NUM_FINGERTIPS:]
+        )
+        if hand_scale is None:
+            return None
+        
+        return _polygon_area(positions[:_NUM_FINGERTIPS]), hand_scale
+    
+    def _get_hand_scale(self, state_manager, positions, valid):
+        """
+        Estimate characteristic hand size as the median of wrist/knuckle distances.
+        
+        The result is cached and only re-measured every
+        hand_scale_refresh_frames frames of the state manager.
+        
+        Args:
+            state_manager: GestureStateManager instance
+            positions: (5, 3) array of the _HAND_SCALE_NAMES landmarks
+            valid: (5,) bool mask of which rows of positions are available
+        
+        Returns:
+            float: Hand scale, or None if unavailable
+        """
+        frame_index = state_manager.frame_index
+        cached_frame = self._cached_hand_scale_frame
+        if (self._cached_hand_scale is not None and cached_frame is not None
+                and 0 <= frame_index - cached_frame < self.hand_scale_refresh_frames):
+            return self._cached_hand_scale
+        
+        hand_scale = None
+        if valid.all():
+            hand_scale = _hand_scale(positions, _HAND_SCALE_PAIRS, 1e-5)
+            if hand_scale == 0.0:
+                hand_scale = None
+        
+        self._cached_hand_scale = hand_scale
+        self._cached_hand_scale_frame = frame_index
+        return hand_scale
     
-    def _get_hand_scale(self, state_manager):
-        """Estimate characteristic hand size for normalization."""
-        distance_pairs = [
-            ('right_wrist', 'right_index_finger_mcp'),
-            ('right_wrist', 'right_middle_finger_mcp'),
-            ('right_wrist', 'right_ring_finger_mcp'),
-            ('right_wrist', 'right_pinky_mcp'),
-            ('right_index_finger_mcp', 'right_pinky_mcp'),
-        ]
-        
-        distances = []
-        for start, end in distance_pairs:
-            dist = state_manager.get_landmark_distance(start, end)
-            if dist is not None and dist > 1e-5:
-                distances.append(dist)
-        
-        if not distances:
+    def _get_inv_shoulder_distance(self, state_manager, left_shoulder, right_shoulder):
+        """
+        Get 1 / shoulder distance for velocity normalization.
+        
+        Shoulder width changes slowly, so the value is cached and only
+        re-measured every shoulder_scale_refresh_frames frames. Unusable
+        measurements are not cached.
+        
+        Args:
+            state_manager: GestureStateManager instance
+            left_shoulder: numpy array [x, y, z] for the current left shoulder (or None)
+            right_shoulder: numpy array [x, y, z] for the current right shoulder
+        
+        Returns:
+            float: Inverse shoulder distance, or None if unavailable
+        """
+        frame_index = state_manager.frame_index
+        cached_frame = self._inv_shoulder_distance_frame
+        if (self._inv_shoulder_distance is not None and cached_frame is not None
+                and 0 <= frame_index - cached_frame < self.shoulder_scale_refresh_frames):
+            return self._inv_shoulder_distance
+        
+        shoulder_distance = self._get_shoulder_distance(left_shoulder, right_shoulder)
+        if shoulder_distance is None or shoulder_distance < 1e-5:
             return None
         
-        return float(np.median(distances))
+        self._inv_shoulder_distance = 1.0 / shoulder_distance
+        self._inv_shoulder_distance_frame = frame_index
+        return self._inv_shoulder_distance
     
-    def _get_shoulder_distance(self, state_manager):
+    def _get_shoulder_distance(self, left_shoulder, right_shoulder):
         """
         Calculate the distance between the two shoulders (landmarks 11 and 12).
         This is used to normalize velocities for scale-invariance.
         
         Args:
-            state_manager: GestureStateManager instance
+            left_shoulder: numpy array [x, y, z] for pose landmark 11 (or None)
+            right_shoulder: numpy array [x, y, z] for pose landmark 12 (or None)
         
         Returns:
             float: Distance between shoulders, or None if landmarks not available
         """
-        # Pose landmarks 11 = left shoulder, 12 = right shoulder
-        left_shoulder = state_manager.get_landmark_position('left_shoulder')
-        right_shoulder = state_manager.get_landmark_position('right_shoulder')
-        
         if left_shoulder is None or right_shoulder is None:
             return None
         
-        return float(np.linalg.norm(right_shoulder - left_shoulder))
+        return _point_distance(left_shoulder, right_shoulder)
+    
+    def _stop_hold(self):
+        """End the current hold and return the stop action code."""
+        self._is_holding = False
+        self._last_motion_time = _NO_TIME
+        return Action.STOP_HOLD
     
     def _handle_tracking_lost(self):
         """Handle loss of tracking information."""
-        if self._state['is_holding']:
-            self._state['is_holding'] = False
-            self._state['last_motion_time'] = None
-            return {'action': 'mining_stop_hold'}
-        
-        return None
+        # Clear the signal trackers once when tracking drops, not on every lost frame
+        if not isnan(self._osc_mean):
+            self._reset_oscillation()
+        if not isnan(self._vy_lp):
+            self._reset_velocity_filter()
+        # The user may come back at a different distance from the camera
+        self._invalidate_scale_cache()
+        if self._is_holding:
+            return self._stop_hold()
+        
+        return Action.NONE
+    
+    def _invalidate_scale_cache(self):
+        """Drop the cached hand scale and shoulder distance so both are re-measured."""
+        self._cached_hand_scale = None
+        self._cached_hand_scale_frame = None
+        self._inv_shoulder_distance = None
+        self._inv_shoulder_distance_frame = None
      
     def reset(self):
         """Reset mining detector state."""
-        self._state = {
-            'is_holding': False,
-            'last_motion_time': None,
-        }
+        self._is_holding = False
+        self._idle_frame_counter = 0
+        self._last_motion_time = _NO_TIME
+        self._invalidate_scale_cache()
+        self._reset_oscillation()
+        self._reset_velocity_filter()
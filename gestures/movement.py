@@ -15,9 +15,12 @@ Key features:
 - Temporal smoothing to reduce jitter
 """
 
-from collections import deque
+import math
 import numpy as np
+from gestures import _movement_kernels
+from gestures._movement_kernels import _leg_features, _leg_motion_score
 from gestures.base_detector import BaseGestureDetector
+from utils.state_manager import POSE_LANDMARK_INDEX, POSE_VISIBILITY, POSE_X, POSE_Y
 
 
 # Detection thresholds (tuned for stability over speed)
@@ -26,19 +29,53 @@ WALK_ENTER_THRESHOLD = 0.28   # Enter WALKING state (higher to reduce false trig
 WALK_EXIT_THRESHOLD = 0.12    # Exit to IDLE (hysteresis gap)
 VISIBILITY_THRESHOLD = 0.7     # MediaPipe visibility confidence minimum (stricter)
 MIN_STABLE_FRAMES = 3          # Frames required for stable state transition
+STABILITY_DELTA = 0.05         # Max frame-to-frame score change still counted as stable
 
 # Leg motion signal shaping
 LEG_MIN_SPEED = 0.04           # Minimum normalized vertical speed to consider
 LEG_MIN_RANGE = 0.015          # Minimum normalized vertical range to consider
 ANTI_PHASE_WINDOW = 5          # Frames to evaluate left/right anti-phase pattern
 ANTI_PHASE_MIN_RATIO = 0.6     # Proportion of frames needing opposite vertical velocity signs
+_ANTI_PHASE_MASK = (1 << ANTI_PHASE_WINDOW) - 1  # Keeps the last ANTI_PHASE_WINDOW flag bits
+_ANTI_PHASE_MIN_FRAMES = max(3, ANTI_PHASE_WINDOW // 2)  # Frames recorded before gating applies
+# Minimum opposite-sign frames out of n recorded frames, indexed by n, or 0
+# while fewer than _ANTI_PHASE_MIN_FRAMES are recorded (the epsilon absorbs
+# float error in frames * ratio, e.g. 5 * 0.6 > 3)
+_ANTI_PHASE_MIN_COUNTS = tuple(
+    math.ceil(frames * ANTI_PHASE_MIN_RATIO - 1e-9) if frames >= _ANTI_PHASE_MIN_FRAMES else 0
+    for frames in range(ANTI_PHASE_WINDOW + 1)
+)
 
 # Lean/strafe thresholds (with hysteresis)
 LEAN_ENTER_THRESHOLD = 0.025   # Enter lean state (normalized by scale)
 LEAN_EXIT_THRESHOLD = 0.012    # Exit lean state (hysteresis)
 LEAN_DEADZONE = 0.010          # Minimum displacement to ignore (noise/small movements)
+LEAN_CONSISTENT_FRAMES = 3     # Consecutive matching frames required to report a lean
 LEAN_COOLDOWN_FRAMES = 10      # Frames to wait after lean ends before allowing walking (0.5s at 30fps)
 
+# Lean direction indexed by (displacement > 0), and per direction the result
+# indexed by whether the magnitude clears the hysteresis bound
+_LEAN_DIRECTIONS = ('right', 'left')
+_LEAN_RESULTS = {'left': (None, 'left'), 'right': (None, 'right')}
+
+# Landmarks that must be visible for torso lean detection, and their pose rows
+_TORSO_LANDMARKS = ('left_shoulder', 'right_shoulder', 'left_hip', 'right_hip')
+_TORSO_INDICES = np.array([POSE_LANDMARK_INDEX[name] for name in _TORSO_LANDMARKS])
+
+# Pose rows of the landmarks the torso-height scale is measured between
+_SCALE_INDICES = np.array([POSE_LANDMARK_INDEX[name] for name in ('nose', 'left_hip', 'right_hip')])
+
+# Leg landmark pairs in fallback order: (left row, right row, use_knees flag)
+_LEG_LANDMARK_FALLBACKS = (
+    (POSE_LANDMARK_INDEX['left_ankle'], POSE_LANDMARK_INDEX['right_ankle'], False),  # Most sensitive to leg motion
+    (POSE_LANDMARK_INDEX['left_knee'], POSE_LANDMARK_INDEX['right_knee'], True),     # More reliable, less occluded
+    (POSE_LANDMARK_INDEX['left_hip'], POSE_LANDMARK_INDEX['right_hip'], True),       # Very conservative detection
+)
+
+# Frames spanned by the leg velocity and by the leg range of motion
+LEG_VELOCITY_WINDOW = 5        # ~0.17 seconds at 30fps
+LEG_RANGE_WINDOW = 15
+
 
 class MovementState:
     """
@@ -68,7 +105,7 @@ class MovementState:
         
         # Check if score is stable (small change from previous frame)
         score_delta = abs(leg_motion_score - self.last_leg_motion_score)
-        if score_delta < 0.5:  # Stability threshold
+        if score_delta < STABILITY_DELTA:
             self.stable_frame_count += 1
         else:
             self.stable_frame_count = 0
@@ -97,6 +134,86 @@ class MovementState:
         return False
 
 
+class SlidingWindow:
+    """
+    Sliding window of the last maxlen values with an O(1) mean and a median.
+    
+    Values live in a preallocated list of maxlen slots that is overwritten
+    oldest-first (mean and median don't depend on order, so the slots are
+    never rotated), and a running sum is updated as values enter and leave
+    the window instead of summing the whole window on every read.
+    """
+    
+    def __init__(self, maxlen):
+        self._values = [0.0] * maxlen
+        self._count = 0  # Number of slots holding values
+        self._next = 0   # Slot the next value is written to
+        self._sum = 0.0
+    
+    def __len__(self):
+        return self._count
+    
+    def append(self, value):
+        """Add a value, evicting the oldest one if the window is full."""
+        slot = self._next
+        if self._count == len(self._values):
+            self._sum -= self._values[slot]
+        else:
+            self._count += 1
+        self._values[slot] = value
+        self._sum += value
+        slot += 1
+        self._next = 0 if slot == len(self._values) else slot
+    
+    @property
+    def mean(self):
+        """Mean of the values in the window (window must not be empty)."""
+        return self._sum / self._count
+    
+    @property
+    def median(self):
+        """Median of the values in the window (window must not be empty)."""
+        # Windows are a handful of values, so sorting a copy is cheapest.
+        # Until the window fills, the values are the first _count slots.
+        count = self._count
+        ordered = sorted(self._values if count == len(self._values) else self._values[:count])
+        mid = count // 2
+        if count % 2:
+            return ordered[mid]
+        return 0.5 * (ordered[mid - 1] + ordered[mid])
+    
+    def clear(self):
+        """Empty the window."""
+        self._count = 0
+        self._next = 0
+        self._sum = 0.0
+
+
+class _FrameContext:
+    """
+    Per-frame inputs shared by the helpers of one detect() call.
+    
+    Built once at the top of detect() so the helpers don't each go back to
+    the state manager for the same frame.
+    """
+    
+    __slots__ = ('pose', 'history', 'visible', 'inv_scale', 'dt')
+    
+    def __init__(self, state_manager, inv_scale):
+        # Latest pose frame and the recent pose history (oldest first)
+        self.pose = state_manager.get_pose_frame()
+        self.history = state_manager.get_pose_history(LEG_RANGE_WINDOW)
+        # Per pose row, whether the landmark meets VISIBILITY_THRESHOLD: one
+        # vectorized comparison over the pose ring's visibility column, so
+        # the helpers only index it. Missing landmarks are NaN and compare
+        # False, just like a visibility of 0.0 would.
+        self.visible = (
+            self.pose[:, POSE_VISIBILITY] >= VISIBILITY_THRESHOLD if self.pose is not None else None
+        )
+        self.inv_scale = inv_scale
+        self.dt = state_manager.dt
+
+
 class MovementDetector(BaseGestureDetector):
     """
     Detects walking, sprinting, and strafing based on body movement.
@@ -109,6 +226,8 @@ class MovementDetector(BaseGestureDetector):
     which is more robust to camera angles than 3D vector approaches.
     """
     
+    _kernels = _movement_kernels
+    
     def __init__(self, 
                  lean_enter_threshold=LEAN_ENTER_THRESHOLD, 
                  lean_exit_threshold=LEAN_EXIT_THRESHOLD,
@@ -119,12 +238,20 @@ class MovementDetector(BaseGestureDetector):
         self.movement_state = MovementState()
         
         # Smoothing buffers for temporal filtering
-        self.leg_motion_history = deque(maxlen=5)
-        self.lean_history = deque(maxlen=5)
-        self.anti_phase_history = deque(maxlen=ANTI_PHASE_WINDOW)
+        self.leg_motion_history = SlidingWindow(maxlen=5)
+        
+        # Run of identical per-frame lean values: the value and its length
+        self.lean_run_value = None
+        self.lean_run_length = 0
+        
+        # Anti-phase flags of the last ANTI_PHASE_WINDOW frames packed into an
+        # int (newest in bit 0), plus how many frames have been recorded
+        self.anti_phase_bits = 0
+        self.anti_phase_frames = 0
         
         # Calibration data
         self.scale_factor = None  # Torso height for normalization
+        self._inv_scale = None    # 1 / scale_factor, so per-frame normalization multiplies
         self.baseline_ankle_y = None
         
         # Configurable lean detection thresholds
@@ -164,9 +291,13 @@ class MovementDetector(BaseGestureDetector):
             self.scale_factor = self._compute_scale_factor(state_manager)
             if self.scale_factor is None:
                 return None  # Can't normalize without scale
+            self._inv_scale = 1.0 / self.scale_factor
+        
+        # Everything the helpers need from this frame, gathered once
+        ctx = _FrameContext(state_manager, self._inv_scale)
         
         # Detect torso lean for strafing first (to track state changes)
-        torso_lean = self._detect_torso_lean_simple(state_manager)
+        torso_lean = self._detect_torso_lean_simple(state_manager, ctx)
         
         # Track lean state changes for cooldown management
         if self.last_lean_detected is not None and torso_lean is None:
@@ -182,7 +313,7 @@ class MovementDetector(BaseGestureDetector):
         self.last_lean_detected = torso_lean
         
         # Detect leg motion (walking-in-place)
-        leg_motion_score = self._detect_leg_motion(state_manager)
+        leg_motion_score = self._detect_leg_motion(ctx)
         
         # Apply cooldown: suppress walking detection if we're in cooldown period
         if self.lean_cooldown_timer > 0:
@@ -217,26 +348,31 @@ class MovementDetector(BaseGestureDetector):
             float: Torso height in normalized coordinates (typically ~0.3-0.5)
                    or None if landmarks unavailable
         """
-        nose = state_manager.get_landmark_position('nose')
-        left_hip = state_manager.get_landmark_position('left_hip')
-        right_hip = state_manager.get_landmark_position('right_hip')
-        
-        if nose is None or left_hip is None or right_hip is None:
+        pose = state_manager.get_pose_frame()
+        if pose is None:
             return None
         
-        # Calculate mid-hip position
-        mid_hip = (np.array(left_hip) + np.array(right_hip)) / 2.0
+        # Plain float math: NumPy call overhead dwarfs the arithmetic for
+        # 3-vectors. The three rows come out of the pose array in one gather,
+        # with no per-landmark array or view in between.
+        (nose_x, nose_y, nose_z), (left_x, left_y, left_z), (right_x, right_y, right_z) = (
+            pose[_SCALE_INDICES, :3].tolist()
+        )
         
         # Torso height = distance from nose to mid-hip
-        torso_height = np.linalg.norm(np.array(nose) - mid_hip)
-        
-        # Sanity check: torso height should be reasonable
-        if torso_height < 0.1:  # Too small, likely tracking error
+        dx = nose_x - 0.5 * (left_x + right_x)
+        dy = nose_y - 0.5 * (left_y + right_y)
+        dz = nose_z - 0.5 * (left_z + right_z)
+        torso_height = math.sqrt(dx * dx + dy * dy + dz * dz)
+        
+        # Sanity check: torso height should be reasonable. A missing (NaN)
+        # landmark fails this check too.
+        if not torso_height >= 0.1:  # Too small, likely tracking error
             return None
         
         return torso_height
     
-    def _detect_leg_motion(self, state_manager):
+    def _detect_leg_motion(self, ctx):
         """
         Detect walking-in-place motion via ankle/knee oscillation.
         
@@ -245,106 +381,58 @@ class MovementDetector(BaseGestureDetector):
         ankles → knees → hips if landmarks are occluded.
         
         Args:
-            state_manager: GestureStateManager instance
+            ctx: _FrameContext for the current frame
         
         Returns:
             float: Leg motion score (0.0 = no motion, 0.15+ = clear walking)
         """
         # Get best available landmarks with fallback strategy
-        left_name, right_name, use_knees = self._get_best_leg_landmarks(
-            state_manager
-        )
+        left_index, right_index, use_knees = self._get_best_leg_landmarks(ctx)
         
-        if left_name is None:
+        if left_index is None:
             return 0.0  # No valid landmarks available
         
-        # Calculate vertical velocities (Y-axis in normalized coordinates)
-        window_size = 5  # ~0.17 seconds at 30fps
-        left_vel = state_manager.get_velocity(left_name, window_size)
-        right_vel = state_manager.get_velocity(right_name, window_size)
+        # Vertical velocities (Y-axis in normalized coordinates) over the
+        # last LEG_VELOCITY_WINDOW frames and range of motion over the
+        # history window, from one pass over the pair's Y column. Missing
+        # frames are skipped for the ranges; need at least half the window
+        # to compute a meaningful range.
+        y_positions = ctx.history[:, (left_index, right_index), POSE_Y]
+        left_vy, right_vy, left_range, right_range = _leg_features(
+            y_positions, LEG_VELOCITY_WINDOW, ctx.dt * (LEG_VELOCITY_WINDOW - 1),
+            LEG_RANGE_WINDOW // 2
+        )
         
-        if left_vel is None or right_vel is None:
+        if math.isnan(left_vy) or math.isnan(right_vy):
             return 0.0
         
-        # Extract Y-component (vertical motion in image coordinates)
-        # Normalize by scale so values are relative to body size
-        left_vy_raw = left_vel[1] / self.scale_factor
-        right_vy_raw = right_vel[1] / self.scale_factor
-        left_vy = abs(left_vy_raw)
-        right_vy = abs(right_vy_raw)
-        avg_vertical_speed = (left_vy + right_vy) / 2.0
-        
-        # Calculate range of motion (Y-coordinate variation over window)
-        left_range = self._calculate_y_range(state_manager, left_name, 15)
-        right_range = self._calculate_y_range(state_manager, right_name, 15)
-        avg_range = (left_range + right_range) / 2.0
-        
-        # Normalize by scale factor (body dimensions)
-        normalized_speed = avg_vertical_speed
-        normalized_range = avg_range / self.scale_factor
-
-        # Apply basic deadzones to ignore tiny vibrations
-        if normalized_speed < LEG_MIN_SPEED and normalized_range < LEG_MIN_RANGE:
-            normalized_speed = 0.0
-            normalized_range = 0.0
-        
-        # Combined score: velocity + range indicates walking
-        # Scale factors chosen to bring scores into ~0-1 range
-        velocity_component = normalized_speed * 8.0
-        range_component = normalized_range * 4.0
-        leg_motion_score = (velocity_component + range_component) / 2.0
+        # Combined score: scale-normalized vertical speed + range indicates
+        # walking, with deadzones to ignore tiny vibrations. Also reports
+        # whether the legs currently move in opposite vertical directions.
+        leg_motion_score, opposite_sign = _leg_motion_score(
+            left_vy, right_vy, left_range, right_range,
+            ctx.inv_scale, LEG_MIN_SPEED, LEG_MIN_RANGE
+        )
 
         # Anti-phase gating: walking-in-place exhibits opposite vertical
         # velocities between left/right legs. Suppress score if not present
         # in a short temporal window to avoid false positives from body sway.
-        opposite_sign = (
-            left_vy_raw * right_vy_raw < 0 and
-            left_vy >= LEG_MIN_SPEED and right_vy >= LEG_MIN_SPEED
-        )
-        self.anti_phase_history.append(1 if opposite_sign else 0)
-        if len(self.anti_phase_history) >= max(3, ANTI_PHASE_WINDOW // 2):
-            ratio = sum(self.anti_phase_history) / len(self.anti_phase_history)
-            if ratio < ANTI_PHASE_MIN_RATIO:
-                leg_motion_score = 0.0
+        # (state read into locals once and written back once)
+        bits = ((self.anti_phase_bits << 1) | bool(opposite_sign)) & _ANTI_PHASE_MASK
+        frames = min(self.anti_phase_frames + 1, ANTI_PHASE_WINDOW)
+        self.anti_phase_bits = bits
+        self.anti_phase_frames = frames
+        # count / frames < ratio, as one integer comparison (the table holds
+        # 0 until enough frames are recorded, so it never gates early)
+        if bits.bit_count() < _ANTI_PHASE_MIN_COUNTS[frames]:
+            leg_motion_score = 0.0
         
-        # Apply temporal smoothing to reduce jitter
+        # Apply temporal smoothing to reduce jitter (median, so a single-frame
+        # spike can't push the score over the walking threshold on its own)
         self.leg_motion_history.append(leg_motion_score)
-        if len(self.leg_motion_history) > 0:
-            smoothed_score = sum(self.leg_motion_history) / len(self.leg_motion_history)
-            return smoothed_score
-        
-        return leg_motion_score
+        return self.leg_motion_history.median
     
-    def _calculate_y_range(self, state_manager, landmark_name, window_frames):
-        """
-        Calculate range of Y-coordinate variation over time window.
-        
-        This measures how much the landmark moves vertically, which indicates
-        leg lifting motion during walking-in-place.
-        
-        Args:
-            state_manager: GestureStateManager instance
-            landmark_name: Name of landmark to track
-            window_frames: Number of frames to analyze
-        
-        Returns:
-            float: Range of Y-coordinates (max - min)
-        """
-        y_positions = []
-        history_len = len(state_manager.landmark_history)
-        
-        for i in range(min(window_frames, history_len)):
-            pos = state_manager.get_landmark_position(landmark_name, i)
-            if pos is not None:
-                y_positions.append(pos[1])
-        
-        # Need at least half the window to compute meaningful range
-        if len(y_positions) < window_frames // 2:
-            return 0.0
-        
-        return max(y_positions) - min(y_positions)
-    
-    def _get_best_leg_landmarks(self, state_manager):
+    def _get_best_leg_landmarks(self, ctx):
         """
         Get best available leg landmarks with fallback strategy.
         
@@ -352,68 +440,22 @@ class MovementDetector(BaseGestureDetector):
         This ensures detection continues even when lower landmarks are occluded.
         
         Args:
-            state_manager: GestureStateManager instance
+            ctx: _FrameContext for the current frame
         
         Returns:
-            tuple: (left_landmark_name, right_landmark_name, use_knees_flag)
+            tuple: (left_pose_row, right_pose_row, use_knees_flag)
                    or (None, None, False) if no valid landmarks
         """
-        # Try ankles first (most sensitive to leg motion)
-        if self._check_visibility(state_manager, ['left_ankle', 'right_ankle']):
-            return ('left_ankle', 'right_ankle', False)
-        
-        # Fallback to knees (more reliable, less occluded)
-        if self._check_visibility(state_manager, ['left_knee', 'right_knee']):
-            return ('left_knee', 'right_knee', True)
-        
-        # Fallback to hips (very conservative detection)
-        if self._check_visibility(state_manager, ['left_hip', 'right_hip']):
-            return ('left_hip', 'right_hip', True)
+        visible = ctx.visible
+        if visible is not None:
+            for left_index, right_index, use_knees in _LEG_LANDMARK_FALLBACKS:
+                if visible[left_index] and visible[right_index]:
+                    return (left_index, right_index, use_knees)
         
         # No valid landmarks available
         return (None, None, False)
     
-    def _check_visibility(self, state_manager, landmark_names):
-        """
-        Check if landmarks are visible with sufficient confidence.
-        
-        Args:
-            state_manager: GestureStateManager instance
-            landmark_names: List of landmark names to check
-        
-        Returns:
-            bool: True if all landmarks meet visibility threshold
-        """
-        if not state_manager.landmark_history:
-            return False
-        
-        landmarks_dict = state_manager.landmark_history[-1]
-        
-        for name in landmark_names:
-            visibility = self._get_landmark_visibility(landmarks_dict, name)
-            if visibility < VISIBILITY_THRESHOLD:
-                return False
-        
-        return True
-    
-    def _get_landmark_visibility(self, landmarks_dict, landmark_name):
-        """
-        Extract visibility score for specific landmark.
-        
-        Args:
-            landmarks_dict: Dictionary from pose_tracking with landmark data
-            landmark_name: Name of landmark to get visibility for
-        
-        Returns:
-            float: Visibility score (0.0-1.0) or 0.0 if not found
-        """
-        if landmarks_dict.get('pose'):
-            for lm in landmarks_dict['pose']:
-                if lm.get('name') == landmark_name:
-                    return lm.get('visibility', 0.0)
-        return 0.0
-    
-    def _detect_torso_lean_simple(self, state_manager):
+    def _detect_torso_lean_simple(self, state_manager, ctx):
         """
         Simple torso lean detection using shoulder-to-hip X-coordinate displacement.
         
@@ -424,64 +466,59 @@ class MovementDetector(BaseGestureDetector):
         
         Args:
             state_manager: GestureStateManager instance
+            ctx: _FrameContext for the current frame
         
         Returns:
             str: 'left', 'right', or None
         """
-        left_shoulder = state_manager.get_landmark_position('left_shoulder')
-        right_shoulder = state_manager.get_landmark_position('right_shoulder')
-        left_hip = state_manager.get_landmark_position('left_hip')
-        right_hip = state_manager.get_landmark_position('right_hip')
-        
-        if left_shoulder is None or right_shoulder is None or left_hip is None or right_hip is None:
+        # Check visibility of required landmarks (one gather of the four
+        # mask cells) before smoothing anything
+        visible = ctx.visible
+        if visible is None or not visible[_TORSO_INDICES].all():
             return None
         
-        # Check visibility of required landmarks
-        if not self._check_visibility(state_manager,
-                                      ['left_shoulder', 'right_shoulder', 'left_hip', 'right_hip']):
-            return None
+        # Savitzky-Golay smoothed X positions (one gather), so single-frame
+        # MediaPipe jitter doesn't flip the lean hysteresis
+        smoothed = state_manager.get_smoothed_pose_frame()
+        left_shoulder_x, right_shoulder_x, left_hip_x, right_hip_x = (
+            smoothed[_TORSO_INDICES, POSE_X].tolist()
+        )
         
         # Calculate shoulder midpoint X-coordinate
-        shoulder_mid_x = (left_shoulder[0] + right_shoulder[0]) / 2.0
+        shoulder_mid_x = (left_shoulder_x + right_shoulder_x) / 2.0
         
         # Calculate hip midpoint X-coordinate
-        hip_mid_x = (left_hip[0] + right_hip[0]) / 2.0
+        hip_mid_x = (left_hip_x + right_hip_x) / 2.0
         
         # Horizontal displacement (normalized by scale)
         # Positive displacement = shoulders right of hips = leaning left
-        displacement = (shoulder_mid_x - hip_mid_x) / self.scale_factor
+        displacement = (shoulder_mid_x - hip_mid_x) * ctx.inv_scale
 
         magnitude = abs(displacement)
-        direction = 'left' if displacement > 0 else 'right'
+        direction = _LEAN_DIRECTIONS[displacement > 0]
 
-        # Apply deadzone to filter out noise and small movements
-        if magnitude < self.lean_deadzone:
-            lean = None
+        # Hysteresis: require larger magnitude to enter (or switch sides) than
+        # to stay in the current lean. The bound includes the deadzone that
+        # filters out noise and small movements, so the classification is a
+        # single comparison and table lookup rather than a branch chain.
+        if direction == self.last_lean_detected:
+            bound = max(self.lean_deadzone, self.lean_exit_threshold)
         else:
-            prev = self.last_lean_detected
-            # Hysteresis: require larger magnitude to enter than to stay
-            if prev is None:
-                if magnitude >= self.lean_enter_threshold:
-                    lean = direction
-                else:
-                    lean = None
-            else:
-                if direction == prev:
-                    # Stay in current lean until it drops below exit threshold
-                    lean = prev if magnitude >= self.lean_exit_threshold else None
-                else:
-                    # Switching sides requires meeting enter threshold
-                    lean = direction if magnitude >= self.lean_enter_threshold else None
-        
-        # Apply temporal smoothing: require consistent lean for 2/3 frames
-        self.lean_history.append(lean)
-
+            bound = max(self.lean_deadzone, self.lean_enter_threshold)
+        lean = _LEAN_RESULTS[direction][magnitude >= bound]
+        
         # Temporal smoothing with hysteresis-aware consistency:
-        # Require 3 consecutive matching frames to assert a lean,
-        # which dramatically reduces flicker and false strafes.
-        if len(self.lean_history) >= 3:
-            if self.lean_history[-1] == self.lean_history[-2] == self.lean_history[-3]:
-                return self.lean_history[-1]
+        # Require LEAN_CONSISTENT_FRAMES consecutive matching frames to assert
+        # a lean, which dramatically reduces flicker and false strafes. Only
+        # the current run of identical values is tracked.
+        if lean == self.lean_run_value:
+            self.lean_run_length += 1
+        else:
+            self.lean_run_value = lean
+            self.lean_run_length = 1
+        
+        if self.lean_run_length >= LEAN_CONSISTENT_FRAMES:
+            return lean
 
         return None
     
@@ -490,8 +527,12 @@ class MovementDetector(BaseGestureDetector):
         super().reset()
         self.movement_state = MovementState()
         self.leg_motion_history.clear()
-        self.lean_history.clear()
+        self.lean_run_value = None
+        self.lean_run_length = 0
+        self.anti_phase_bits = 0
+        self.anti_phase_frames = 0
         self.scale_factor = None
+        self._inv_scale = None
         self.baseline_ankle_y = None
         self.lean_cooldown_timer = 0
         self.last_lean_detected = None
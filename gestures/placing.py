@@ -2,10 +2,61 @@
 Placing/using items gesture detector
 """
 
-import time
+import math
 import numpy as np
 
+from gestures import _placing_kernels
+from gestures._placing_kernels import _pentagon_area
 from gestures.base_detector import BaseGestureDetector
+from utils.state_manager import _HAND_LANDMARK_IDS, LANDMARK_NAME_TO_ID, POSE_LANDMARK_INDEX
+
+
+# Right-hand fingertips outlining the spread polygon
+_FINGERTIP_NAMES = (
+    "right_thumb_tip",
+    "right_index_finger_tip",
+    "right_middle_finger_tip",
+    "right_ring_finger_tip",
+    "right_pinky_tip",
+)
+_FINGERTIP_IDS = tuple(LANDMARK_NAME_TO_ID[name] for name in _FINGERTIP_NAMES)
+_FINGERTIP_GROUP = _FINGERTIP_IDS[0][0]  # All fingertips come from the right-hand list
+
+# Landmark pairs whose median distance is the last-resort hand scale
+_HAND_SCALE_PAIRS = (
+    ("right_wrist", "right_index_finger_mcp"),
+    ("right_wrist", "right_middle_finger_mcp"),
+    ("right_wrist", "right_ring_finger_mcp"),
+    ("right_wrist", "right_pinky_mcp"),
+    ("right_index_finger_mcp", "right_pinky_mcp"),
+)
+
+# Pose rows of the body scale landmarks: left/right shoulder, left/right hip
+_BODY_SCALE_INDICES = np.array([
+    POSE_LANDMARK_INDEX[name] for name in ("left_shoulder", "right_shoulder", "left_hip", "right_hip")
+])
+
+
+def _landmark_ids(name):
+    """
+    (group, index) IDs to try for a landmark name, in lookup order.
+    
+    Same precedence as GestureStateManager.get_landmark_position(): the pose
+    landmark first, then the hand landmark of the same name (e.g. the
+    right-hand wrist when the pose has no 'right_wrist').
+    """
+    ids = (LANDMARK_NAME_TO_ID[name],)
+    hand_id = _HAND_LANDMARK_IDS.get(name)
+    if hand_id is not None and hand_id != ids[0]:
+        ids += (hand_id,)
+    return ids
+
+
+# Hand scale landmark pairs resolved to candidate (group, index) IDs at
+# import, so the per-frame lookups index the landmark lists directly
+_HAND_SCALE_ID_PAIRS = tuple(
+    (_landmark_ids(start), _landmark_ids(end)) for start, end in _HAND_SCALE_PAIRS
+)
 
 
 class PlacingDetector(BaseGestureDetector):
@@ -14,6 +65,8 @@ class PlacingDetector(BaseGestureDetector):
     sequence, independent of forearm position.
     """
 
+    _kernels = _placing_kernels
+
     def __init__(self):
         super().__init__("placing")
 
@@ -28,13 +81,24 @@ class PlacingDetector(BaseGestureDetector):
         self.fallback_open_threshold = 0.030  # More lenient fallback threshold
         self.fallback_area_delta = 0.035  # Adjusted delta for fallback
         
-        # Timing thresholds (seconds)
+        # Timing thresholds (seconds, compared against state_manager.current_time)
         self.close_to_open_window = 0.6  # Even longer window for natural motion
         self.cooldown = 0.5
+
+        # Body scale changes slowly, so only re-measure it every N frames
+        self.scale_refresh_frames = 5
         
         # Debug mode
         self.debug = False  # Disable debug logging for production
 
+        # Fingertip positions, refilled in place every frame
+        self._fingertip_buf = np.empty((len(_FINGERTIP_NAMES), 3))
+
+        # Last hand scale seen and 1 / scale**2 for it, so the area is
+        # normalized with a multiply and only recomputed when the scale changes
+        self._cached_scale = None
+        self._inv_scale_sq = None
+
         self.reset()
 
     def detect(self, state_manager):
@@ -48,7 +112,14 @@ class PlacingDetector(BaseGestureDetector):
         if not self.enabled:
             return None
 
-        current_time = time.time()
+        # Right hand not tracked this frame (the common case when the user
+        # isn't placing): treat as tracking lost before doing any other work
+        history = state_manager.landmark_history
+        if not history or not history[-1].get(_FINGERTIP_GROUP):
+            self._handle_tracking_lost()
+            return None
+
+        current_time = state_manager.current_time
         hand_metrics = self._get_hand_metrics(state_manager)
         if hand_metrics is None:
             self._handle_tracking_lost()
@@ -56,13 +127,15 @@ class PlacingDetector(BaseGestureDetector):
 
         raw_area = hand_metrics["normalized_area"]
         
-        # Apply LIGHTER smoothing to reduce noise but remain responsive (alpha = 0.5)
-        normalized_area = raw_area
-        if self._state["last_area"] is not None:
-            normalized_area = 0.5 * raw_area + 0.5 * self._state["last_area"]
+        previous_area = self._last_area
+        previous_time = self._last_area_time
         
-        previous_area = self._state["last_area"]
-        previous_time = self._state["last_area_time"]
+        # Apply LIGHTER smoothing to reduce noise but remain responsive (alpha = 0.5).
+        # Written as 0.5 * (a + b), which is exactly 0.5 * a + 0.5 * b with one
+        # intermediate float instead of two.
+        normalized_area = raw_area
+        if previous_area is not None:
+            normalized_area = 0.5 * (raw_area + previous_area)
 
         growth_rate = None
         if previous_area is not None and previous_time is not None:
@@ -77,54 +150,54 @@ class PlacingDetector(BaseGestureDetector):
             base_area = recent_min_area
 
         area_increase = normalized_area - base_area
-        cooldown_active = current_time < self._state["cooldown_end"]
+        cooldown_active = current_time < self._cooldown_end
         
         time_since_close = None
-        if self._state["last_close_time"] is not None:
-            time_since_close = current_time - self._state["last_close_time"]
-        
-        # Primary detection path: Fast opening with growth rate
-        primary_trigger = (
-            not cooldown_active
-            and time_since_close is not None
-            and time_since_close <= self.close_to_open_window
-            and normalized_area >= self.open_threshold
-            and area_increase >= self.min_area_delta
-            and growth_rate is not None
-            and growth_rate >= self.area_growth_rate_threshold
-        )
-        
-        # Fallback detection path: Strong area increase even if slower
-        fallback_trigger = (
-            not cooldown_active
-            and time_since_close is not None
-            and time_since_close <= self.close_to_open_window
-            and normalized_area >= self.fallback_open_threshold
-            and area_increase >= self.fallback_area_delta
-            and growth_rate is not None
-            and growth_rate >= self.area_growth_rate_threshold * 0.5  # 50% of primary threshold
-        )
+        if self._last_close_time is not None:
+            time_since_close = current_time - self._last_close_time
         
-        # Rapid opening detection: Very fast growth regardless of absolute area
-        rapid_trigger = (
+        # Guards shared by every detection path: out of cooldown, within the
+        # close-to-open window, and a growth rate to judge. Checked once, so
+        # the usual not-armed frame skips the path-specific comparisons.
+        armed = (
             not cooldown_active
             and time_since_close is not None
             and time_since_close <= self.close_to_open_window
             and growth_rate is not None
-            and growth_rate >= self.area_growth_rate_threshold * 1.2  # 20% faster than primary
-            and area_increase >= self.min_area_delta * 0.6  # At least 60% of min delta
         )
         
-        # Ultra-permissive trigger: Any significant opening from closed state
-        permissive_trigger = (
-            not cooldown_active
-            and time_since_close is not None
-            and time_since_close <= self.close_to_open_window
-            and normalized_area >= 0.030  # Based on actual values
-            and area_increase >= 0.025  # Based on actual deltas
-            and growth_rate is not None
-            and growth_rate >= 0.20  # Based on actual growth rates
-        )
+        primary_trigger = fallback_trigger = rapid_trigger = permissive_trigger = False
+        if armed:
+            # Thresholds shared between paths, read once
+            growth_threshold = self.area_growth_rate_threshold
+            min_area_delta = self.min_area_delta
+            
+            # Primary detection path: Fast opening with growth rate
+            primary_trigger = (
+                normalized_area >= self.open_threshold
+                and area_increase >= min_area_delta
+                and growth_rate >= growth_threshold
+            )
+            
+            # Fallback detection path: Strong area increase even if slower
+            fallback_trigger = (
+                normalized_area >= self.fallback_open_threshold
+                and area_increase >= self.fallback_area_delta
+                and growth_rate >= growth_threshold * 0.5  # 50% of primary threshold
+            )
+            
+            # Rapid opening detection: Very fast growth regardless of absolute area
+            rapid_trigger = (
+                growth_rate >= growth_threshold * 1.2  # 20% faster than primary
+                and area_increase >= min_area_delta * 0.6  # At least 60% of min delta
+            )
+            
+            # Ultra-permissive trigger: Any significant opening from closed state
+            permissive_trigger = (
+                normalized_area >= 0.030  # Based on actual values
+                and area_increase >= 0.025  # Based on actual deltas
+                and growth_rate >= 0.20  # Based on actual growth rates
+            )
 
         detection = None
         should_trigger = primary_trigger or fallback_trigger or rapid_trigger or permissive_trigger
@@ -144,9 +217,9 @@ class PlacingDetector(BaseGestureDetector):
             else:  # permissive_trigger
                 confidence = self._compute_confidence(area_increase, growth_rate) * 0.8
             
-            self._state["cooldown_end"] = current_time + self.cooldown
-            self._state["last_close_time"] = None
-            self._state["recent_min_area"] = None
+            self._cooldown_end = current_time + self.cooldown
+            self._last_close_time = None
+            self._recent_min_area = None
 
             detection = {
                 "action": "place",
@@ -162,8 +235,8 @@ class PlacingDetector(BaseGestureDetector):
                 }
             }
 
-        self._state["last_area"] = normalized_area
-        self._state["last_area_time"] = current_time
+        self._last_area = normalized_area
+        self._last_area_time = current_time
 
         return detection
 
@@ -174,27 +247,19 @@ class PlacingDetector(BaseGestureDetector):
         Returns:
             dict or None - {"normalized_area": float, "scale_type": str} when landmarks available.
         """
-        fingertip_names = [
-            "right_thumb_tip",
-            "right_index_finger_tip",
-            "right_middle_finger_tip",
-            "right_ring_finger_tip",
-            "right_pinky_tip",
-        ]
-
-        points = []
-        for name in fingertip_names:
-            pos = state_manager.get_landmark_position(name)
-            if pos is None:
-                return None
-            points.append((float(pos[0]), float(pos[1])))
+        batch = state_manager.get_landmarks_by_id(_FINGERTIP_IDS, out=self._fingertip_buf)
+        if not batch[1].all():
+            return None
 
-        raw_area = self._polygon_area(points)
+        raw_area = _pentagon_area(batch[0])
         hand_scale, scale_type = self._get_hand_scale(state_manager)
         if hand_scale is None:
             return None
 
-        normalized_area = raw_area / max(hand_scale ** 2, 1e-6)
+        if hand_scale != self._cached_scale:
+            self._cached_scale = hand_scale
+            self._inv_scale_sq = 1.0 / max(hand_scale * hand_scale, 1e-6)
+        normalized_area = raw_area * self._inv_scale_sq
         return {
             "normalized_area": float(normalized_area),
             "scale_type": scale_type,
@@ -202,57 +267,97 @@ class PlacingDetector(BaseGestureDetector):
             "scale": float(hand_scale)
         }
 
-    @staticmethod
-    def _polygon_area(points):
-        """Compute planar area via the shoelace formula."""
-        area = 0.0
-        count = len(points)
-        for i in range(count):
-            x1, y1 = points[i]
-            x2, y2 = points[(i + 1) % count]
-            area += x1 * y2 - x2 * y1
-        return abs(area) * 0.5
-
     def _get_hand_scale(self, state_manager):
         """Estimate a scale factor using shoulder distance for camera-distance independence.
         
+        The result is cached and only re-measured every scale_refresh_frames
+        frames of the state manager. Unusable measurements are not cached.
+        
         Returns:
             tuple: (scale_value, scale_type) or (None, None)
         """
-        # Try shoulder distance first (most reliable for full-body tracking)
-        shoulder_dist = state_manager.get_landmark_distance("left_shoulder", "right_shoulder")
-        if shoulder_dist is not None and shoulder_dist > 1e-5:
-            return float(shoulder_dist), "shoulder"
+        frame_index = state_manager.frame_index
+        cached_frame = self._hand_scale_cache_frame
+        if (cached_frame is not None
+                and 0 <= frame_index - cached_frame < self.scale_refresh_frames):
+            return self._hand_scale_cache
         
-        # Fallback to torso width if shoulders not visible
-        hip_dist = state_manager.get_landmark_distance("left_hip", "right_hip")
-        if hip_dist is not None and hip_dist > 1e-5:
-            return float(hip_dist), "hip"
+        scale = self._measure_hand_scale(state_manager)
+        if scale[0] is not None:
+            self._hand_scale_cache = scale
+            self._hand_scale_cache_frame = frame_index
+        return scale
+
+    def _measure_hand_scale(self, state_manager):
+        """Measure the scale factor for _get_hand_scale() (see there)."""
+        pose = state_manager.get_pose_frame()
+        if pose is not None:
+            # Shoulder and hip rows in one gather; plain float math, since
+            # NumPy call overhead dwarfs the arithmetic for 3-vectors. A
+            # missing landmark is NaN, which fails the > checks below.
+            (lsx, lsy, lsz), (rsx, rsy, rsz), (lhx, lhy, lhz), (rhx, rhy, rhz) = (
+                pose[_BODY_SCALE_INDICES, :3].tolist()
+            )
+            
+            # Try shoulder distance first (most reliable for full-body tracking)
+            shoulder_dist = math.sqrt((lsx - rsx) ** 2 + (lsy - rsy) ** 2 + (lsz - rsz) ** 2)
+            if shoulder_dist > 1e-5:
+                return shoulder_dist, "shoulder"
+            
+            # Fallback to torso width if shoulders not visible
+            hip_dist = math.sqrt((lhx - rhx) ** 2 + (lhy - rhy) ** 2 + (lhz - rhz) ** 2)
+            if hip_dist > 1e-5:
+                return hip_dist, "hip"
         
         # Last resort: use hand-based measurements (original method)
-        distance_pairs = [
-            ("right_wrist", "right_index_finger_mcp"),
-            ("right_wrist", "right_middle_finger_mcp"),
-            ("right_wrist", "right_ring_finger_mcp"),
-            ("right_wrist", "right_pinky_mcp"),
-            ("right_index_finger_mcp", "right_pinky_mcp"),
-        ]
-
         distances = []
-        for start, end in distance_pairs:
-            dist = state_manager.get_landmark_distance(start, end)
+        for start_ids, end_ids in _HAND_SCALE_ID_PAIRS:
+            dist = self._landmark_distance(state_manager, start_ids, end_ids)
             if dist is not None and dist > 1e-5:
                 distances.append(dist)
 
         if not distances:
             return None, None
 
-        return float(np.median(distances)), "hand"
+        # Median of at most five values: sorting a small list is far cheaper
+        # than np.median's dispatch (even counts average the middle two, as
+        # np.median does)
+        distances.sort()
+        mid = len(distances) // 2
+        if len(distances) % 2:
+            return float(distances[mid]), "hand"
+        return float(0.5 * (distances[mid - 1] + distances[mid])), "hand"
+
+    @staticmethod
+    def _landmark_distance(state_manager, start_ids, end_ids):
+        """
+        Distance between two landmarks given by resolved IDs.
+        
+        Args:
+            state_manager: GestureStateManager instance
+            start_ids, end_ids: Candidate (group, index) IDs of each landmark
+                from _landmark_ids(); the first available one is used
+        
+        Returns:
+            float: Distance between the landmarks, or None if either is unavailable
+        """
+        start = end = None
+        for landmark_id in start_ids:
+            start = state_manager.get_landmark_position_by_id(landmark_id)
+            if start is not None:
+                break
+        for landmark_id in end_ids:
+            end = state_manager.get_landmark_position_by_id(landmark_id)
+            if end is not None:
+                break
+        if start is None or end is None:
+            return None
+        return np.linalg.norm(start - end)
 
     def _update_recent_min_area(self, current_area, current_time):
         """Track minimum hand area observed during the closed phase with hysteresis."""
-        last_close_time = self._state["last_close_time"]
-        recent_min_area = self._state["recent_min_area"]
+        last_close_time = self._last_close_time
+        recent_min_area = self._recent_min_area
         
         # Use hysteresis: slightly lower threshold to enter closed state
         close_enter_threshold = self.close_threshold
@@ -266,22 +371,22 @@ class PlacingDetector(BaseGestureDetector):
         if is_closing:
             # Update close time on first detection or if we're getting even more closed
             if not was_closed or (recent_min_area is not None and current_area < recent_min_area):
-                self._state["last_close_time"] = current_time
+                self._last_close_time = current_time
             
             # Track minimum area during closed phase
             if recent_min_area is None or current_area < recent_min_area:
                 recent_min_area = current_area
-            self._state["recent_min_area"] = recent_min_area
+            self._recent_min_area = recent_min_area
             return recent_min_area
         
         # If hand was closed but is now opening, use exit threshold for stability
         if was_closed and current_area >= close_exit_threshold:
             # Don't immediately clear - wait for window expiry
             if current_time - last_close_time > self.close_to_open_window:
-                self._state["recent_min_area"] = None
+                self._recent_min_area = None
                 return None
 
-        return self._state["recent_min_area"]
+        return self._recent_min_area
 
     def _compute_confidence(self, area_increase, growth_rate):
         """Compute confidence score based on area change dynamics with improved scaling."""
@@ -307,18 +412,23 @@ class PlacingDetector(BaseGestureDetector):
 
     def _handle_tracking_lost(self):
         """Clear transient state when landmarks become unavailable."""
-        self._state["last_area"] = None
-        self._state["last_area_time"] = None
-        self._state["last_close_time"] = None
-        self._state["recent_min_area"] = None
+        self._invalidate_scale_cache()
+        self._last_area = None
+        self._last_area_time = None
+        self._last_close_time = None
+        self._recent_min_area = None
 
     def reset(self):
         """Reset placing detector state."""
         super().reset()
-        self._state = {
-            "last_area": None,
-            "last_area_time": None,
-            "last_close_time": None,
-            "recent_min_area": None,
-            "cooldown_end": 0.0,
-        }
\ No newline at end of file
+        self._last_area = None
+        self._last_area_time = None
+        self._last_close_time = None
+        self._recent_min_area = None
+        self._cooldown_end = 0.0
+        self._invalidate_scale_cache()
+
+    def _invalidate_scale_cache(self):
+        """Drop the cached scale so it is re-measured on the next frame."""
+        self._hand_scale_cache = (None, None)
+        self._hand_scale_cache_frame = None
\ No newline at end of file
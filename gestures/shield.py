@@ -4,9 +4,20 @@ Shield gesture detector - detects shield blocking gesture
 
 # may need to change logic to look at change in y position
 
-import time
-import numpy as np
+import math
+
+from gestures import _shield_kernels
+from gestures._shield_kernels import _shield_decide
 from gestures.base_detector import BaseGestureDetector
+from utils.state_manager import POSE_LANDMARK_INDEX
+
+# Pose array rows of the left shoulder, elbow and wrist
+_SHOULDER_ROW = POSE_LANDMARK_INDEX['left_shoulder']
+_ELBOW_ROW = POSE_LANDMARK_INDEX['left_elbow']
+_WRIST_ROW = POSE_LANDMARK_INDEX['left_wrist']
+
+# Radians to degrees as a plain multiply
+_RAD_TO_DEG = 180.0 / math.pi
 
 
 class ShieldDetector(BaseGestureDetector):
@@ -22,6 +33,8 @@ class ShieldDetector(BaseGestureDetector):
       * At approximately chest/shoulder height
     """
     
+    _kernels = _shield_kernels
+    
     def __init__(self):
         super().__init__("shield")
         
@@ -29,89 +42,43 @@ class ShieldDetector(BaseGestureDetector):
         self.horizontal_angle_tolerance = 35  # Degrees from horizontal (0° or 180°)
         self.min_forward_distance = 0.10  # Minimum distance wrist should be forward from shoulder
         self.max_height_diff = 0.15  # Maximum vertical difference from shoulder height
+        self.angle_refresh_frames = 8  # Hold frames between forearm angle updates
+        
+        # The horizontal test compares dy² against sin²(tolerance) * |forearm|²,
+        # which is the same as angle <= tolerance without atan2 (recompute if
+        # horizontal_angle_tolerance is changed after construction)
+        self._sin2_tol = math.sin(math.radians(self.horizontal_angle_tolerance)) ** 2
         
         # State tracking
         self._state = {
             'is_blocking': False,
             'horizontal_start_time': None,
+            'last_angle': None,  # Forearm angle last reported in a result
+            'hold_frames': 0,  # shield_hold frames since the angle was computed
         }
     
-    def _calculate_forearm_angle(self, elbow_pos, wrist_pos):
+    def _calculate_forearm_angle(self, forearm):
         """
         Calculate the angle of the forearm from horizontal.
         
         Args:
-            elbow_pos: (x, y, z) tuple for elbow position
-            wrist_pos: (x, y, z) tuple for wrist position
+            forearm: [dx, dy, ...] offset from elbow to wrist
         
         Returns:
-            Angle in degrees from horizontal (0-180)
-            Returns None if positions are invalid
+            Angle in degrees from horizontal (0-90)
         """
-        if elbow_pos is None or wrist_pos is None:
-            return None
-        
-        # Calculate vector from elbow to wrist
-        dx = wrist_pos[0] - elbow_pos[0]
-        dy = wrist_pos[1] - elbow_pos[1]  # Note: In image coordinates, y increases downward
+        # Note: In image coordinates, y increases downward, so dy is negated
+        # to flip the y-axis. For a horizontal forearm dy is close to 0.
+        # Scalar math calls rather than NumPy ufuncs, which would coerce
+        # each operand to an array first
+        angle_rad = math.atan2(-forearm[1], abs(forearm[0]))
         
-        # Calculate angle from horizontal
-        # For horizontal forearm, dy should be close to 0
-        angle_rad = np.arctan2(-dy, abs(dx))  # Negative dy to flip y-axis
-        angle_deg = abs(np.degrees(angle_rad))
-        
-        # Return absolute angle from horizontal
         # 0° = horizontal, 90° = vertical
-        return angle_deg
+        return abs(angle_rad) * _RAD_TO_DEG
     
-    def _is_forearm_horizontal(self, elbow_pos, wrist_pos):
-        """
-        Check if forearm is roughly horizontal (parallel to floor).
-        
-        Returns:
-            bool: True if forearm is horizontal within tolerance
-        """
-        angle = self._calculate_forearm_angle(elbow_pos, wrist_pos)
-        if angle is None:
-            return False
-        
-        # Check if angle is close to horizontal (near 0°)
-        return angle <= self.horizontal_angle_tolerance
-    
-    def _is_wrist_forward(self, shoulder_pos, wrist_pos):
-        """
-        Check if wrist is forward from shoulder (in front of body).
-        
-        Args:
-            shoulder_pos: (x, y, z) tuple for shoulder position
-            wrist_pos: (x, y, z) tuple for wrist position
-        
-        Returns:
-            bool: True if wrist is sufficiently forward
-        """
-        if shoulder_pos is None or wrist_pos is None:
-            return False
-        
-        # In MediaPipe, z-axis points toward camera (negative z = closer to camera)
-        # Wrist should be closer to camera than shoulder
-        forward_distance = shoulder_pos[2] - wrist_pos[2]
-        
-        return forward_distance >= self.min_forward_distance
-    
-    def _is_at_chest_height(self, shoulder_pos, wrist_pos):
-        """
-        Check if wrist is at roughly shoulder/chest height.
-        
-        Returns:
-            bool: True if wrist is near shoulder height
-        """
-        if shoulder_pos is None or wrist_pos is None:
-            return False
-        
-        # Check vertical difference
-        height_diff = abs(shoulder_pos[1] - wrist_pos[1])
-        
-        return height_diff <= self.max_height_diff
+    def _forearm_angle_from_pose(self, pose):
+        """Forearm angle (see _calculate_forearm_angle) of a pose frame array."""
+        return self._calculate_forearm_angle((pose[_WRIST_ROW, :2] - pose[_ELBOW_ROW, :2]).tolist())
     
     def detect(self, state_manager):
         """
@@ -130,70 +97,69 @@ class ShieldDetector(BaseGestureDetector):
         if not self.enabled:
             return None
         
-        # Get left arm and shoulder positions from state manager
-        left_shoulder = state_manager.get_landmark_position('left_shoulder', frame_offset=0)
-        left_elbow = state_manager.get_landmark_position('left_elbow', frame_offset=0)
-        left_wrist = state_manager.get_landmark_position('left_wrist', frame_offset=0)
-        
-        if left_shoulder is None or left_elbow is None or left_wrist is None:
+        pose = state_manager.get_pose_frame()
+        
+        # Check all three conditions for sword/shield blocking position in
+        # one compiled call (cheapest first, so the common non-blocking frame
+        # stops early):
+        # 1. Wrist is forward from shoulder (in front of body)
+        # 2. Wrist is at approximately chest/shoulder height
+        # 3. Forearm is roughly horizontal (parallel to floor)
+        decision = -1
+        if pose is not None:
+            decision = _shield_decide(
+                pose, _SHOULDER_ROW, _ELBOW_ROW, _WRIST_ROW,
+                self._sin2_tol, self.min_forward_distance, self.max_height_diff
+            )
+        
+        if decision < 0:
             # Can't detect without all landmarks, stop blocking if active
             if self._state['is_blocking']:
                 self._state['is_blocking'] = False
                 return {'action': 'shield_stop'}
             return None
         
-        # Convert numpy arrays to tuples for consistency
-        shoulder_pos = tuple(left_shoulder)
-        elbow_pos = tuple(left_elbow)
-        wrist_pos = tuple(left_wrist)
-        
-        # Check all three conditions for sword/shield blocking position:
-        # 1. Forearm is roughly horizontal (parallel to floor)
-        is_horizontal = self._is_forearm_horizontal(elbow_pos, wrist_pos)
-        
-        # 2. Wrist is forward from shoulder (in front of body)
-        is_forward = self._is_wrist_forward(shoulder_pos, wrist_pos)
-        
-        # 3. Wrist is at approximately chest/shoulder height
-        is_chest_height = self._is_at_chest_height(shoulder_pos, wrist_pos)
-        
-        # All three conditions must be met
-        is_blocking_position = is_horizontal and is_forward and is_chest_height
-        
         # Update state and return action
-        if is_blocking_position:
+        if decision:
             if not self._state['is_blocking']:
-                # Track time in blocking position
+                # Track time in blocking position (monotonic seconds)
+                current_time = state_manager.current_time
                 if self._state['horizontal_start_time'] is None:
                     # First frame in blocking position - record start time
-                    self._state['horizontal_start_time'] = time.time()
+                    self._state['horizontal_start_time'] = current_time
                     return None
                 
                 # Check if 0.5 seconds have elapsed
-                elapsed_time = time.time() - self._state['horizontal_start_time']
+                elapsed_time = current_time - self._state['horizontal_start_time']
                 if elapsed_time >= 0.5:
                     # Start blocking after 0.5 second delay
                     self._state['is_blocking'] = True
-                    angle = self._calculate_forearm_angle(elbow_pos, wrist_pos)
+                    self._state['last_angle'] = self._forearm_angle_from_pose(pose)
+                    self._state['hold_frames'] = 0
                     return {
                         'action': 'shield_start',
-                        'horizontal': is_horizontal,
-                        'forward': is_forward,
-                        'chest_height': is_chest_height,
-                        'angle': angle
+                        'horizontal': True,
+                        'forward': True,
+                        'chest_height': True,
+                        'angle': self._state['last_angle']
                     }
                 else:
                     # Still within 0.5 second window
                     return None
             else:
-                # Continue blocking
-                angle = self._calculate_forearm_angle(elbow_pos, wrist_pos)
+                # Continue blocking. The angle is only diagnostic, so it is
+                # refreshed every angle_refresh_frames frames rather than
+                # recomputed on every frame of a long hold
+                self._state['hold_frames'] += 1
+                if self._state['hold_frames'] >= self.angle_refresh_frames:
+                    self._state['hold_frames'] = 0
+                    self._state['last_angle'] = self._forearm_angle_from_pose(pose)
                 return {
                     'action': 'shield_hold',
-                    'horizontal': is_horizontal,
-                    'forward': is_forward,
-                    'chest_height': is_chest_height,
-                    'angle': angle
+                    'horizontal': True,
+                    'forward': True,
+                    'chest_height': True,
+                    'angle': self._state['last_angle']
                 }
         else:
             # Reset timer when not in blocking position
@@ -209,4 +175,6 @@ class ShieldDetector(BaseGestureDetector):
         self._state = {
             'is_blocking': False,
             'horizontal_start_time': None,
+            'last_angle': None,  # Forearm angle last reported in a result
+            'hold_frames': 0,  # shield_hold frames since the angle was computed
         }
\ No newline at end of file
@@ -3,7 +3,10 @@ Main control loop for webcam input and landmark detection with gesture recogniti
 """
 
 import cv2
+import numpy as np
+import queue
 import sys
+import threading
 import time
 from cv.pose_tracking import get_landmarks, draw_landmarks, cleanup
 
@@ -24,14 +27,94 @@ from gestures.attack import AttackDetector
 from gestures.looking import LookingDetector
 from gestures.hand_scroll import HandScrollDetector
 
+# Static help line drawn at the bottom of the debug preview
+_FOOTER_TEXT = "MineMotion - Press 'q' to quit, 'd' for debug, 'r' to toggle gestures"
+
+
+def _render_footer(frame_width, frame_height):
+    """
+    Pre-render the static footer line and its background box.
+    
+    Produces the same pixels as drawing it through the overlay loop, so
+    each frame only needs a slice copy instead of a getTextSize, rectangle
+    and anti-aliased putText.
+    
+    Args:
+        frame_width: Width of the preview frame in pixels
+        frame_height: Height of the preview frame in pixels
+    
+    Returns:
+        (top, left, patch): patch is the BGR image to copy into
+        frame[top:top + patch_height, left:left + patch_width]
+    """
+    font_face = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 0.4
+    thickness = 1
+    padding = 6
+    x, y = 10, frame_height - 10
+    
+    (text_width, text_height), baseline = cv2.getTextSize(_FOOTER_TEXT, font_face, font_scale, thickness)
+    top = max(y - text_height - padding, 0)
+    left = max(x - padding, 0)
+    # The filled rectangle includes its bottom-right corner
+    bottom = min(y + baseline + padding, frame_height - 1)
+    right = min(x + text_width + padding, frame_width - 1)
+    
+    patch = np.zeros((bottom - top + 1, right - left + 1, 3), dtype=np.uint8)
+    cv2.putText(patch, _FOOTER_TEXT, (x - left, y - top), font_face, font_scale, (255, 255, 255), thickness)
+    return top, left, patch
+
+
+def _capture_worker(cap, frame_queue, stop_event):
+    """
+    Capture webcam frames and extract their landmarks on a background thread.
+    
+    Runs capture and MediaPipe inference concurrently with the main thread's
+    detection, drawing, imshow and waitKey, so display latency no longer
+    holds up the next cap.read().
+    
+    Args:
+        cap: Opened cv2.VideoCapture
+        frame_queue: Bounded queue.Queue receiving (frame, landmarks_dict)
+            tuples; when it is full the oldest entry is dropped so the main
+            thread always gets the freshest frame. None is queued when
+            capture fails or the worker exits
+        stop_event: threading.Event that ends the loop when set
+    """
+    def put_latest(item):
+        while True:
+            try:
+                frame_queue.put_nowait(item)
+                return
+            except queue.Full:
+                # Drop the oldest frame to make room
+                try:
+                    frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    try:
+        while not stop_event.is_set():
+            # read() split into grab() and retrieve(): grab() waits for the
+            # next frame, so re-check for shutdown before paying for the
+            # decode and inference of a frame nobody will display
+            if not cap.grab() or stop_event.is_set():
+                break
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            put_latest((frame, get_landmarks(frame)))
+    finally:
+        put_latest(None)
+
 
 def main():
     """
     Main gameplay loop with gesture detection and action coordination.
     
     Architecture:
-    1. Capture webcam frame
-    2. Extract MediaPipe landmarks
+    1. Capture webcam frame (capture thread)
+    2. Extract MediaPipe landmarks (capture thread)
     3. Update state manager with landmark history
     4. Run all gesture detectors
     5. Coordinate and execute game actions
@@ -52,10 +135,18 @@ def main():
         print("Error: Could not open webcam.")
         sys.exit(1)
     
+    # Ask for MJPG before setting the resolution: uncompressed YUY2 at 720p
+    # saturates USB 2.0 and caps the frame rate well below 30 FPS. Cameras
+    # without MJPG ignore this and keep their default format
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    
     # Set camera resolution
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
     
+    # Keep at most one frame queued in the driver so reads aren't stale
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
     # Initialize state manager for temporal tracking
     state_manager = GestureStateManager(history_size=30, fps=30)
     print("✓ State Manager initialized")
@@ -103,11 +194,18 @@ def main():
     
     # Main loop state
     debug_display = True
+    # Looking detector only builds its HUD debug data while the debug display is on
+    gesture_detectors['looking'].debug = debug_display
     calibrated = False # TODO: implement calibration
     frame_count = 0
     fps_start_time = time.time()
     current_fps = 0
     
+    # Mirrored preview frame, reused every frame once allocated
+    mirror_buf = None
+    # ((width, height), (top, left, patch)) of the pre-rendered footer
+    footer = None
+    
     # Track OS cursor free/locked to trigger menu entry automatically
     cursor_free_prev = None
     
@@ -124,17 +222,28 @@ def main():
     cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
     cv2.moveWindow(window_name, 0, 0)  # Position at top-left corner
     
+    # Capture and landmark extraction run on a background thread, handing
+    # frames to this loop through a small drop-oldest queue
+    frame_queue = queue.Queue(maxsize=2)
+    stop_capture = threading.Event()
+    capture_thread = threading.Thread(
+        target=_capture_worker,
+        args=(cap, frame_queue, stop_capture),
+        name='capture',
+        daemon=True
+    )
+    capture_thread.start()
+    
     try:
         while True:
-            # Capture frame from webcam
-            ret, frame = cap.read()
+            # === STEP 1: Get the next frame and its MediaPipe landmarks ===
+            item = frame_queue.get()
             
-            if not ret:
+            if item is None:
                 print("Error: Failed to capture frame.")
                 break
             
-            # === STEP 1: Get landmarks from MediaPipe ===
-            landmarks_dict = get_landmarks(frame)
+            frame, landmarks_dict = item
             
             # === STEP 2: Update state manager with new landmark data ===
             state_manager.update(landmarks_dict)
@@ -154,12 +263,15 @@ def main():
                 cursor_free_prev = cursor_free if cursor_free is not None else cursor_free_prev
                 # Run all enabled gesture detectors
                 for name, detector in gesture_detectors.items():
+                    # Skip disabled detectors without a method call
+                    if not detector.enabled:
+                        continue
                     # Pass menu mode flag to cursor_control detector
                     if name == 'cursor_control':
                         # Auto-detect based on OS cursor state inside detector
                         result = detector.detect(state_manager, force_menu_mode=None)
                     else:
-                        result = detector.detect(state_manager)
+                        result = detector.detect_frame(landmarks_dict, state_manager)
                     if result is not None:
                         gesture_results[name] = result
                 
@@ -210,12 +322,15 @@ def main():
                         pass
             
             # === STEP 5: Prepare frame for display ===
-            frame_display = frame.copy()
+            # Annotate the captured frame itself: nothing else reads it after
+            # detection, and each cap.read() returns a fresh array
+            frame_display = frame
             overlay_texts = []
             
             if debug_display:
                 if landmarks_dict is not None:
-                    frame_display = draw_landmarks(frame_display, landmarks_dict)
+                    # Draws in place
+                    draw_landmarks(frame_display, landmarks_dict)
                     
                     # Get action coordinator status
                     action_status = action_coordinator.get_status()
@@ -558,17 +673,11 @@ def main():
                     'color': (255, 255, 255),
                     'thickness': 1
                 })
-                
-                overlay_texts.append({
-                    'text': "MineMotion - Press 'q' to quit, 'd' for debug, 'r' to toggle gestures",
-                    'position': (10, frame_height - 10),
-                    'scale': 0.4,
-                    'color': (255, 255, 255),
-                    'thickness': 1
-                })
             
-            # Mirror the frame for preview only
-            frame_display = cv2.flip(frame_display, 1)
+            # Mirror the frame for preview only, into a buffer reused across
+            # frames (allocated by the first flip)
+            mirror_buf = cv2.flip(frame_display, 1, mirror_buf)
+            frame_display = mirror_buf
             frame_height, frame_width = frame_display.shape[:2]
             
             # Draw textual overlays on mirrored frame
@@ -613,6 +722,13 @@ def main():
                     thickness
                 )
             
+            # Static footer, rendered once per frame size and copied in
+            if debug_display:
+                if footer is None or footer[0] != (frame_width, frame_height):
+                    footer = ((frame_width, frame_height), _render_footer(frame_width, frame_height))
+                top, left, patch = footer[1]
+                frame_display[top:top + patch.shape[0], left:left + patch.shape[1]] = patch
+            
             # Show the frame
             cv2.imshow(window_name, frame_display)
             
@@ -633,6 +749,7 @@ def main():
                 print(f"\nGestures: {'ENABLED' if gestures_enabled else 'DISABLED'}")
             elif key == ord('d'):
                 debug_display = not debug_display
+                gesture_detectors['looking'].debug = debug_display
                 print(f"\nDebug display: {'ON' if debug_display else 'OFF'}")
             elif key == ord('c'):
                 if landmarks_dict is not None:
@@ -658,6 +775,13 @@ def main():
         action_coordinator.reset()
         print("✓ Released all game controls")
         
+        # Stop the capture thread before releasing the webcam it reads from.
+        # Wait for it to finish rather than timing out: releasing the capture
+        # during an in-flight grab() crashes some VideoCapture backends, and
+        # the worker checks the stop event after every frame
+        stop_capture.set()
+        capture_thread.join()
+        
         # Release webcam
         cap.release()
         cv2.destroyAllWindows()
@@ -2,8 +2,9 @@
 Action Coordinator - Coordinates gesture detection results with game controls
 """
 
+import math
+
 from controls.keyboard_mouse import MinecraftController
-import numpy as np
 
 # Configuration constants
 HEAD_LOOK_SENSITIVITY = 5.0  # Adjust as needed
@@ -72,7 +73,11 @@ class ActionCoordinator:
         if left_shoulder is None or right_shoulder is None:
             return gesture_results
 
-        shoulder_distance = float(np.linalg.norm(left_shoulder - right_shoulder))
+        shoulder_distance = math.hypot(
+            float(left_shoulder[0]) - float(right_shoulder[0]),
+            float(left_shoulder[1]) - float(right_shoulder[1]),
+            float(left_shoulder[2]) - float(right_shoulder[2]),
+        )
         if shoulder_distance <= 1e-6:
             return gesture_results
 
@@ -0,0 +1,44 @@
+"""
+Optional JIT compilation support for per-frame math kernels
+"""
+
+# Try to import numba; detectors fall back to plain Python when it is missing
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Kernel modules already warmed up in this process
+_warmed_up = set()
+
+
+def warm_up(kernels):
+    """
+    Compile a kernels module's functions before the first camera frame.
+    
+    Runs each sample call in the module's WARM_UP_CALLS once per process, so
+    numba compiles (or loads from its cache) the signatures the detector
+    uses at construction instead of on the first frame. Without numba the
+    calls are cheap plain-Python runs.
+    
+    Args:
+        kernels: Module defining WARM_UP_CALLS, a sequence of (kernel, args)
+            pairs with the same argument types and array layouts as the
+            detector's real calls
+    """
+    if kernels.__name__ in _warmed_up:
+        return
+    for kernel, args in kernels.WARM_UP_CALLS:
+        kernel(*args)
+    _warmed_up.add(kernels.__name__)
@@ -7,6 +7,79 @@ import numpy as np
 import time
 
 
+# MediaPipe landmark names in index order, matching the lists built by
+# cv.pose_tracking.get_landmarks() (hand names get a 'left_'/'right_' prefix)
+POSE_LANDMARK_NAMES = (
+    'nose', 'left_eye_inner', 'left_eye', 'left_eye_outer', 'right_eye_inner', 'right_eye',
+    'right_eye_outer', 'left_ear', 'right_ear', 'mouth_left', 'mouth_right',
+    'left_shoulder', 'right_shoulder', 'left_elbow', 'right_elbow', 'left_wrist', 'right_wrist',
+    'left_pinky', 'right_pinky', 'left_index', 'right_index', 'left_thumb', 'right_thumb',
+    'left_hip', 'right_hip', 'left_knee', 'right_knee', 'left_ankle', 'right_ankle',
+    'left_heel', 'right_heel', 'left_foot_index', 'right_foot_index',
+)
+HAND_LANDMARK_NAMES = (
+    'wrist', 'thumb_cmc', 'thumb_mcp', 'thumb_ip', 'thumb_tip',
+    'index_finger_mcp', 'index_finger_pip', 'index_finger_dip', 'index_finger_tip',
+    'middle_finger_mcp', 'middle_finger_pip', 'middle_finger_dip', 'middle_finger_tip',
+    'ring_finger_mcp', 'ring_finger_pip', 'ring_finger_dip', 'ring_finger_tip',
+    'pinky_mcp', 'pinky_pip', 'pinky_dip', 'pinky_tip',
+)
+
+# Pose landmark name -> index into a frame's 'pose' list (and pose array rows)
+POSE_LANDMARK_INDEX = {name: index for index, name in enumerate(POSE_LANDMARK_NAMES)}
+
+# Columns of the per-frame pose arrays
+POSE_X, POSE_Y, POSE_Z, POSE_VISIBILITY = range(4)
+
+# Savitzky-Golay smoothing of pose trajectories: fit a polynomial of this order
+# to the last POSE_SMOOTHING_WINDOW frames and evaluate it at the newest one
+# (causal, so no added latency)
+POSE_SMOOTHING_WINDOW = 7
+POSE_SMOOTHING_ORDER = 2
+
+
+def _savgol_endpoint_coeffs(window, order):
+    """
+    FIR weights (oldest frame first) of a Savitzky-Golay fit evaluated at the newest frame.
+    
+    The least-squares polynomial value at t=0 is linear in the samples, so
+    it reduces to a dot product with the first row of the pseudo-inverse of
+    the Vandermonde matrix over t = -(window-1)..0.
+    """
+    t = np.arange(-(window - 1), 1, dtype=np.float64)
+    vandermonde = np.vander(t, order + 1, increasing=True)
+    return np.linalg.pinv(vandermonde)[0]
+
+
+_POSE_SMOOTHING_COEFFS = _savgol_endpoint_coeffs(POSE_SMOOTHING_WINDOW, POSE_SMOOTHING_ORDER)
+
+
+def _build_landmark_ids():
+    """Map each landmark name to its (group, index) ID."""
+    ids = {}
+    for index, name in enumerate(HAND_LANDMARK_NAMES):
+        ids['left_' + name] = ('left_hand', index)
+        ids['right_' + name] = ('right_hand', index)
+    # Pose entries overwrite the hand ones sharing a name ('left_wrist',
+    # 'right_wrist'), matching the precedence of get_landmark_position
+    for index, name in enumerate(POSE_LANDMARK_NAMES):
+        ids[name] = ('pose', index)
+    return ids
+
+
+# Landmark name -> (group, index) ID for the *_by_id lookups, so detectors
+# can resolve names once instead of scanning for them every frame
+LANDMARK_NAME_TO_ID = _build_landmark_ids()
+
+# Hand landmark IDs on their own, for the names the pose shadows when a
+# frame has hands but no pose
+_HAND_LANDMARK_IDS = {
+    side + '_' + name: (side + '_hand', index)
+    for side in ('left', 'right')
+    for index, name in enumerate(HAND_LANDMARK_NAMES)
+}
+
+
 class GestureStateManager:
     """
     Manages temporal state for gesture detection including:
@@ -44,6 +117,36 @@ class GestureStateManager:
         
         # Last update time
         self.last_update_time = None
+        
+        # Monotonic clock of the latest update(), read once per frame and
+        # shared by the detectors (integer nanoseconds, and seconds)
+        self.current_time_ns = time.monotonic_ns()
+        self.current_time = self.current_time_ns / 1e9
+        
+        # Count of landmark frames received (never reset, so detectors can
+        # use it as a cache key for per-frame or every-N-frames results)
+        self.frame_index = 0
+        
+        # Pose landmarks of the same frames as landmark_history, stored as a
+        # ring of (33, 4) float32 arrays (x, y, z, visibility per row, NaN when
+        # missing) so detectors can slice them instead of walking the dicts.
+        # Every frame is written twice, to slot i and slot i + history_size,
+        # so any window of recent frames is one contiguous slice (a view,
+        # no wrap-around gather).
+        self._pose_ring = np.full(
+            (2 * history_size, len(POSE_LANDMARK_NAMES), 4), np.nan, dtype=np.float32
+        )
+        self._pose_ring_head = 0   # Slot the next frame is written to
+        self._pose_ring_count = 0  # Number of valid frames in the ring
+        
+        # Smoothed newest pose frame and the frame_index it was computed for
+        self._smoothed_pose = None
+        self._smoothed_pose_frame = None
+        
+        # get_landmark_position() results for the current history, keyed by
+        # (landmark_name, frame_offset); the same few landmarks are looked up
+        # by several detectors per frame. Cleared by update().
+        self._position_cache = {}
     
     def update(self, landmarks_dict):
         """
@@ -55,13 +158,107 @@ class GestureStateManager:
                 May also contain 'left_hand' and 'right_hand' keys for finger landmarks.
         """
         current_time = time.time()
+        self.current_time_ns = time.monotonic_ns()
+        self.current_time = self.current_time_ns / 1e9
+        self._position_cache.clear()
         
         if landmarks_dict is not None:
             self.landmark_history.append(landmarks_dict)
             self.timestamps.append(current_time)
+            self.frame_index += 1
+            self._store_pose_array(landmarks_dict.get('pose'), landmarks_dict.get('pose_array'))
         
         self.last_update_time = current_time
     
+    def _store_pose_array(self, pose_landmarks, pose_array=None):
+        """
+        Write one frame's pose landmarks into the pose ring buffer.
+        
+        Args:
+            pose_landmarks: The frame's 'pose' list of landmark dicts (or None)
+            pose_array: The same landmarks as an (N, 4) array, if the producer
+                built one; copied in bulk instead of walking the dicts
+        """
+        frame = self._pose_ring[self._pose_ring_head]
+        frame.fill(np.nan)
+        if pose_array is not None:
+            count = min(len(pose_array), len(POSE_LANDMARK_NAMES))
+            frame[:count] = pose_array[:count]
+        elif pose_landmarks:
+            count = min(len(pose_landmarks), len(POSE_LANDMARK_NAMES))
+            frame[:count] = [
+                (lm['x'], lm['y'], lm['z'], lm.get('visibility', 0.0))
+                for lm in pose_landmarks[:count]
+            ]
+        self._pose_ring[self._pose_ring_head + self.history_size] = frame
+        
+        self._pose_ring_head = (self._pose_ring_head + 1) % self.history_size
+        self._pose_ring_count = min(self._pose_ring_count + 1, self.history_size)
+    
+    def get_pose_frame(self, frame_offset=0):
+        """
+        Get one frame's pose landmarks as an array.
+        
+        Args:
+            frame_offset: How many frames back to look (0 = current, 1 = previous, etc.)
+        
+        Returns:
+            (33, 4) float32 array view (columns POSE_X, POSE_Y, POSE_Z,
+            POSE_VISIBILITY; rows indexed by POSE_LANDMARK_INDEX, NaN when
+            missing), or None if not available. Valid until the next update().
+        """
+        if frame_offset >= self._pose_ring_count:
+            return None
+        
+        return self._pose_ring[(self._pose_ring_head - 1 - frame_offset) % self.history_size]
+    
+    def get_smoothed_pose_frame(self):
+        """
+        Get the newest pose frame with Savitzky-Golay smoothed coordinates.
+        
+        x/y/z are smoothed over the last POSE_SMOOTHING_WINDOW frames with a
+        fixed FIR filter; visibility is passed through unsmoothed. Landmarks
+        missing from any frame in the window keep their raw value, and
+        until the window has filled the raw frame is returned. Computed at
+        most once per frame.
+        
+        Returns:
+            (33, 4) array laid out like get_pose_frame(), or None if not available.
+            Treat as read-only.
+        """
+        frame = self.get_pose_frame()
+        if frame is None or self._pose_ring_count < POSE_SMOOTHING_WINDOW:
+            return frame
+        
+        if self._smoothed_pose_frame == self.frame_index:
+            return self._smoothed_pose
+        
+        history = self.get_pose_history(POSE_SMOOTHING_WINDOW)
+        smoothed = np.einsum('t,tlc->lc', _POSE_SMOOTHING_COEFFS, history)
+        missing = np.isnan(smoothed)
+        smoothed[missing] = frame[missing]
+        smoothed[:, POSE_VISIBILITY] = frame[:, POSE_VISIBILITY]
+        
+        self._smoothed_pose = smoothed
+        self._smoothed_pose_frame = self.frame_index
+        return smoothed
+    
+    def get_pose_history(self, window_frames):
+        """
+        Get the most recent pose frames as one array.
+        
+        Args:
+            window_frames: Maximum number of frames to return
+        
+        Returns:
+            (N, 33, 4) float32 array view, oldest frame first, with
+            N = min(window_frames, frames available); see get_pose_frame().
+            Valid until the next update().
+        """
+        count = min(window_frames, self._pose_ring_count)
+        end = self._pose_ring_head + self.history_size
+        return self._pose_ring[end - count:end]
+    
     def set_calibration_baseline(self, landmarks_dict):
         """
         Set the neutral/calibration pose as baseline for relative measurements.
@@ -82,26 +279,93 @@ class GestureStateManager:
         Returns:
             numpy array [x, y, z] or None if not available
         """
+        # Each caller gets its own copy of the cached array, so in-place
+        # arithmetic on the result can't leak into other lookups
+        key = (landmark_name, frame_offset)
+        try:
+            position = self._position_cache[key]
+        except KeyError:
+            pass
+        else:
+            return position.copy() if position is not None else None
+        
+        # Resolve the name to its list index instead of scanning the frame;
+        # pose landmarks take precedence, falling back to the hand landmark
+        # of the same name
+        landmark_id = LANDMARK_NAME_TO_ID.get(landmark_name)
+        position = None
+        if landmark_id is not None:
+            position = self.get_landmark_position_by_id(landmark_id, frame_offset)
+            if position is None and landmark_name in _HAND_LANDMARK_IDS:
+                position = self.get_landmark_position_by_id(_HAND_LANDMARK_IDS[landmark_name], frame_offset)
+        
+        self._position_cache[key] = position
+        return position.copy() if position is not None else None
+    
+    def get_landmark_position_by_id(self, landmark_id, frame_offset=0, out=None):
+        """
+        Get the position of a landmark by its resolved ID (O(1), no name scan).
+        
+        Args:
+            landmark_id: (group, index) tuple from LANDMARK_NAME_TO_ID
+            frame_offset: How many frames back to look (0 = current, 1 = previous, etc.)
+            out: Optional preallocated length-3 array to fill instead of allocating
+        
+        Returns:
+            numpy array [x, y, z] (out if given) or None if not available
+        """
+        if len(self.landmark_history) <= frame_offset:
+            return None
+        
+        group, index = landmark_id
+        group_landmarks = self.landmark_history[-(frame_offset + 1)].get(group)
+        if not group_landmarks or index >= len(group_landmarks):
+            return None
+        
+        landmark = group_landmarks[index]
+        if out is None:
+            return np.array([landmark['x'], landmark['y'], landmark['z']])
+        out[0] = landmark['x']
+        out[1] = landmark['y']
+        out[2] = landmark['z']
+        return out
+    
+    def get_landmarks_by_id(self, landmark_ids, frame_offset=0, out=None):
+        """
+        Get the positions of several landmarks by resolved ID, with a validity mask.
+        
+        Indexes each group list directly instead of scanning for names. A
+        missing landmark doesn't fail the whole batch; its row is left as NaN
+        and marked invalid.
+        
+        Args:
+            landmark_ids: Sequence of (group, index) tuples from LANDMARK_NAME_TO_ID
+            frame_offset: How many frames back to look (0 = current, 1 = previous, etc.)
+            out: Optional preallocated (N, 3) array to fill instead of allocating
+        
+        Returns:
+            Tuple (positions, valid): an (N, 3) numpy array in the order of
+            landmark_ids (out if given) and an (N,) bool array, or None if
+            the frame is not in the history
+        """
         if len(self.landmark_history) <= frame_offset:
             return None
         
         landmarks = self.landmark_history[-(frame_offset + 1)]
         
-        # Try to get from pose landmarks first
-        if landmarks.get('pose'):
-            for landmark in landmarks['pose']:
-                if landmark.get('name') == landmark_name:
-                    return np.array([landmark['x'], landmark['y'], landmark['z']])
-        
-        # Check hand landmarks
-        # Check hand landmarks if not found in pose
-        for hand_type in ['left_hand', 'right_hand']:
-            if hand_type.split('_')[0] in landmark_name.lower() and landmarks.get(hand_type):
-                for landmark in landmarks[hand_type]:
-                    if landmark.get('name') == landmark_name:
-                        return np.array([landmark['x'], landmark['y'], landmark['z']])
-        
-        return None
+        positions = out if out is not None else np.empty((len(landmark_ids), 3))
+        valid = np.zeros(len(landmark_ids), dtype=bool)
+        
+        for row, (group, index) in enumerate(landmark_ids):
+            group_landmarks = landmarks.get(group)
+            if group_landmarks and index < len(group_landmarks):
+                landmark = group_landmarks[index]
+                positions[row] = (landmark['x'], landmark['y'], landmark['z'])
+                valid[row] = True
+            else:
+                positions[row] = np.nan
+        
+        return positions, valid
     
     def get_velocity(self, landmark_name, window_size=3):
         """
@@ -117,6 +381,17 @@ class GestureStateManager:
         if len(self.landmark_history) < window_size:
             return None
         
+        time_delta = self.dt * (window_size - 1)
+        
+        # Pose landmarks: both endpoints from one slice of the pose history
+        pose_index = POSE_LANDMARK_INDEX.get(landmark_name)
+        if pose_index is not None:
+            endpoints = self.get_pose_history(window_size)[::window_size - 1 or 1, pose_index, :3]
+            if not np.isnan(endpoints).any():
+                return (endpoints[-1].astype(np.float64) - endpoints[0]) / time_delta
+            # Missing from the pose in either frame: fall through to the
+            # lookup by name, which also tries the hand landmark of that name
+        
         # Get positions at different time points
         current_pos = self.get_landmark_position(landmark_name, 0)
         past_pos = self.get_landmark_position(landmark_name, window_size - 1)
@@ -125,7 +400,6 @@ class GestureStateManager:
             return None
         
         # Calculate velocity (position change / time)
-        time_delta = self.dt * (window_size - 1)
         velocity = (current_pos - past_pos) / time_delta
         
         return velocity
@@ -175,49 +449,6 @@ class GestureStateManager:
         
         return acceleration
     
-    def is_oscillating(self, landmark_name, threshold=0.05, window_size=15, min_peaks=2):
-        """
-        Detect if a landmark is oscillating (moving back and forth repeatedly).
-        
-        Args:
-            landmark_name: Name of the landmark
-            threshold: Minimum movement threshold to count as motion
-            window_size: Number of frames to analyze
-            min_peaks: Minimum number of direction changes to count as oscillation
-        
-        Returns:
-            bool: True if oscillating, False otherwise
-        """
-        if len(self.landmark_history) < window_size:
-            return False
-        
-        # Get position history
-        positions = []
-        for i in range(min(window_size, len(self.landmark_history))):
-            pos = self.get_landmark_position(landmark_name, i)
-            if pos is not None:
-                positions.append(pos)
-        
-        if len(positions) < window_size // 2:
-            return False
-        
-        # Analyze one dimension (typically y for up/down, x for left/right)
-        # Using y-axis for most gestures
-        y_positions = [pos[1] for pos in positions]
-        
-        # Find peaks and valleys (direction changes)
-        direction_changes = 0
-        for i in range(1, len(y_positions) - 1):
-            if abs(y_positions[i] - y_positions[i-1]) > threshold:
-                # Check if direction changed
-                prev_direction = np.sign(y_positions[i] - y_positions[i-1])
-                next_direction = np.sign(y_positions[i+1] - y_positions[i])
-                
-                if prev_direction != next_direction and prev_direction != 0:
-                    direction_changes += 1
-        
-        return direction_changes >= min_peaks
-    
     def get_relative_position(self, landmark_name, reference_landmark='nose'):
         """
         Get position of a landmark relative to a reference landmark.
@@ -272,6 +503,12 @@ class GestureStateManager:
     def clear_history(self):
         """Clear all history (useful for reset/calibration)."""
         self.landmark_history.clear()
+        self._position_cache.clear()
+        self._pose_ring.fill(np.nan)
+        self._pose_ring_head = 0
+        self._pose_ring_count = 0
+        self._smoothed_pose = None
+        self._smoothed_pose_frame = None
         self.gesture_history.clear()
         self.timestamps.clear()
         self.active_actions.clear()
\ No newline at end of file